@@ -102,6 +102,9 @@ def example_visualization():
     print("2. fig = InkVisualizer.display_multiple_inks(ink_list)")
     print("3. fig = InkVisualizer.plot_stroke_statistics(ink_list)")
     print("4. InkVisualizer.save_visualization(fig, 'output.png')")
+    print("Figures are not managed by pyplot: show them in Jupyter with")
+    print("%matplotlib inline and display(fig), or save them as above.")
+    print("Pass close=True to save_visualization to free a figure after saving.")
 
 
 def example_image_processing():
@@ -1,31 +1,90 @@
+import json
 import os
 import shutil
 import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
 # Paths
 CROHME_DIR = 'data/crohme'
 OUTPUT_IMG = 'data/images'
-OUTPUT_LABEL = 'data/labels'
-
-os.makedirs(OUTPUT_IMG, exist_ok=True)
-os.makedirs(OUTPUT_LABEL, exist_ok=True)
-
-# Iterate over formula XML files
-for root, _, files in os.walk(CROHME_DIR):
-    for fname in files:
-        if fname.endswith('.xml'):
-            xml_path = os.path.join(root, fname)
-            tree = ET.parse(xml_path)
-            root_elem = tree.getroot()
-
-            for expr in root_elem.findall('.//expression'):
-                img_file = expr.get('image')  # e.g., 'GT01.png'
-                latex = expr.find('latex').text
-
-                src_img = os.path.join(root, 'trace', img_file)
-                dst_img = os.path.join(OUTPUT_IMG, img_file)
-                with open(os.path.join(OUTPUT_LABEL, img_file.replace('.png', '.txt')), 'w') as f:
-                    f.write(latex)
-
-                if os.path.exists(src_img):
-                    shutil.copy(src_img, dst_img)
\ No newline at end of file
+LABELS_FILE = 'data/labels.jsonl'
+
+# Number of threads used for copying images
+IO_WORKERS = 32
+
+
+def process_xml(xml_path):
+    """Parse one formula XML file into (src_img, dst_img, img_file, latex) tuples."""
+    root = os.path.dirname(xml_path)
+    root_elem = ET.parse(xml_path).getroot()
+
+    tasks = []
+    for expr in root_elem.findall('.//expression'):
+        img_file = expr.get('image')  # e.g., 'GT01.png'
+        latex = expr.find('latex').text
+
+        src_img = os.path.join(root, 'trace', img_file)
+        dst_img = os.path.join(OUTPUT_IMG, img_file)
+        tasks.append((src_img, dst_img, img_file, latex))
+
+    return tasks
+
+
+def link_or_copy(src, dst):
+    """Hard-link src to dst, falling back to a full copy."""
+    if os.path.lexists(dst):
+        if os.path.exists(dst) and os.path.samefile(src, dst):
+            return
+        # dst may be a hard link to another source image; writing through it
+        # would overwrite that image, so replace the directory entry instead
+        os.unlink(dst)
+    
+    try:
+        os.link(src, dst)
+    except OSError:
+        # Different filesystem or hard links not supported; copyfile uses
+        # the kernel-side sendfile fast path where available
+        shutil.copyfile(src, dst)
+
+
+def copy_image(task):
+    """Copy the image for a single expression, if it exists."""
+    src_img, dst_img, _, _ = task
+
+    if os.path.exists(src_img):
+        link_or_copy(src_img, dst_img)
+
+
+def main():
+    os.makedirs(OUTPUT_IMG, exist_ok=True)
+    os.makedirs(os.path.dirname(LABELS_FILE), exist_ok=True)
+
+    # Collect formula XML files
+    xml_paths = [
+        os.path.join(root, fname)
+        for root, _, files in os.walk(CROHME_DIR)
+        for fname in files
+        if fname.endswith('.xml')
+    ]
+
+    # XML parsing is CPU-bound, so spread it over processes
+    with ProcessPoolExecutor() as executor:
+        tasks = [
+            task
+            for file_tasks in executor.map(process_xml, xml_paths, chunksize=16)
+            for task in file_tasks
+        ]
+
+    # All labels go into one JSONL file rather than one small file each
+    with open(LABELS_FILE, 'w') as f:
+        for _, _, img_file, latex in tasks:
+            f.write(json.dumps({'image': img_file, 'latex': latex}) + '\n')
+
+    # Copying is I/O-bound, so threads are enough
+    with ThreadPoolExecutor(max_workers=IO_WORKERS) as executor:
+        # Consume the results so that any exception is raised here
+        list(executor.map(copy_image, tasks))
+
+
+if __name__ == '__main__':
+    main()
@@ -7,27 +7,122 @@ containing handwritten mathematical expressions.
 
 import dataclasses
 import numpy as np
-from xml.etree import ElementTree
-from typing import List, Dict, Optional
+from lxml import etree
+from typing import List, Dict, Optional, Tuple
 import os
 
 
-@dataclasses.dataclass
+# Fully qualified tag names of the InkML elements read by InkProcessor
+INKML_NAMESPACE = '{http://www.w3.org/2003/InkML}'
+ANNOTATION_TAG = INKML_NAMESPACE + 'annotation'
+TRACE_TAG = INKML_NAMESPACE + 'trace'
+
+
+@dataclasses.dataclass(init=False)
 class Ink:
     """
     Represents a single ink, as read from an InkML file.
     
+    Points of all strokes are stored in one contiguous array, with stroke
+    boundaries kept as offsets into it. Inks can also still be built from a
+    list of per-stroke arrays, as Ink(strokes, annotations) or
+    Ink(strokes=..., annotations=...).
+    
     Attributes:
-        strokes: List of stroke arrays, each with shape (3, number of points)
-                where dimensions are (x, y, timestamp)
+        points: Array with shape (3, total number of points) where dimensions
+                are (x, y, timestamp)
+        stroke_offsets: Start index of every stroke in points, followed by
+                        the total number of points
         annotations: Metadata present in the InkML file
     """
-    # Every stroke in the ink.
-    # Each stroke array has shape (3, number of points), where the first
+    # Every point of every stroke, concatenated in stroke order.
+    # The array has shape (3, total number of points), where the first
     # dimensions are (x, y, timestamp), in that order.
-    strokes: List[np.ndarray]
+    points: np.ndarray
+    # Stroke i spans points[:, stroke_offsets[i]:stroke_offsets[i + 1]].
+    stroke_offsets: np.ndarray
     # Metadata present in the InkML.
     annotations: Dict[str, str]
+    
+    def __init__(self, points: Optional[np.ndarray] = None,
+                 stroke_offsets: Optional[np.ndarray] = None,
+                 annotations: Optional[Dict[str, str]] = None,
+                 *, strokes: Optional[List[np.ndarray]] = None):
+        """
+        Initialize an ink.
+        
+        Args:
+            points: Array with shape (3, total number of points)
+            stroke_offsets: Start index of every stroke in points, followed
+                            by the total number of points
+            annotations: Metadata for the ink
+            strokes: List of stroke arrays, each with shape
+                     (3, number of points), instead of points and
+                     stroke_offsets
+            
+        Raises:
+            TypeError: If neither or both of strokes and points are given
+        """
+        # Original Ink(strokes, annotations) positional form; strokes may be
+        # any sequence of arrays, points is always a single array
+        if points is not None and not isinstance(points, np.ndarray) and strokes is None:
+            if annotations is not None:
+                raise TypeError("Ink() got too many positional arguments")
+            strokes, points, annotations = list(points), None, stroke_offsets
+            stroke_offsets = None
+        
+        if strokes is not None:
+            if points is not None or stroke_offsets is not None:
+                raise TypeError("Ink() takes either strokes or points and stroke_offsets, not both")
+            points, stroke_offsets = Ink._concatenate(strokes)
+        elif points is None or stroke_offsets is None:
+            raise TypeError("Ink() needs strokes, or points and stroke_offsets")
+        
+        self.points = points
+        self.stroke_offsets = stroke_offsets
+        self.annotations = annotations if annotations is not None else {}
+    
+    @staticmethod
+    def _concatenate(strokes: List[np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Concatenate per-stroke arrays into points and stroke offsets.
+        
+        Args:
+            strokes: List of stroke arrays, each with shape (3, number of points)
+            
+        Returns:
+            Tuple of (points, stroke_offsets)
+        """
+        offsets = np.zeros(len(strokes) + 1, dtype=np.int32)
+        if strokes:
+            np.cumsum([stroke.shape[1] for stroke in strokes], out=offsets[1:])
+            points = np.concatenate(strokes, axis=1)
+        else:
+            points = np.empty((3, 0), dtype=np.float32)
+        
+        return points, offsets
+    
+    @classmethod
+    def from_strokes(cls, strokes: List[np.ndarray],
+                     annotations: Optional[Dict[str, str]] = None) -> 'Ink':
+        """
+        Build an ink from a list of per-stroke arrays.
+        
+        Args:
+            strokes: List of stroke arrays, each with shape (3, number of points)
+            annotations: Metadata for the ink
+            
+        Returns:
+            Ink object
+        """
+        return cls(strokes=strokes, annotations=annotations)
+    
+    @property
+    def strokes(self) -> List[np.ndarray]:
+        """List of per-stroke views into points, each with shape (3, number of points)."""
+        if len(self.stroke_offsets) < 2:
+            return []
+        return np.split(self.points, self.stroke_offsets[1:-1], axis=1)
 
 
 class InkProcessor:
@@ -53,38 +148,70 @@ class InkProcessor:
         if not os.path.exists(filename):
             raise FileNotFoundError(f"InkML file not found: {filename}")
             
-        try:
-            with open(filename, "r") as f:
-                root = ElementTree.fromstring(f.read())
-        except ElementTree.ParseError as e:
-            raise ValueError(f"Invalid InkML format: {e}")
-
         strokes = []
         annotations = {}
+        depth = 0
 
-        for element in root:
-            tag_name = element.tag.removeprefix('{http://www.w3.org/2003/InkML}')
-            
-            if tag_name == 'annotation':
-                annotations[element.attrib.get('type')] = element.text
+        # Stream the file instead of building the whole tree up front; only
+        # direct children of the root <ink> element are of interest.
+        try:
+            for event, element in etree.iterparse(
+                    filename, events=('start', 'end'),
+                    resolve_entities=False, no_network=True):
+                if event == 'start':
+                    depth += 1
+                    continue
+                
+                depth -= 1
+                if depth != 1:
+                    continue
+                
+                tag = element.tag
+                
+                if tag == ANNOTATION_TAG or tag == 'annotation':
+                    annotations[element.attrib.get('type')] = element.text
 
-            elif tag_name == 'trace':
-                points = element.text.split(',')
-                stroke_x, stroke_y, stroke_t = [], [], []
+                elif tag == TRACE_TAG or tag == 'trace':
+                    stroke = InkProcessor._parse_trace(element.text or '')
+                    if stroke is not None:  # Only add non-empty strokes
+                        strokes.append(stroke)
                 
-                for point in points:
-                    try:
-                        x, y, t = point.split(' ')
-                        stroke_x.append(float(x))
-                        stroke_y.append(float(y))
-                        stroke_t.append(float(t))
-                    except ValueError:
-                        continue  # Skip malformed points
-                        
-                if stroke_x and stroke_y and stroke_t:  # Only add non-empty strokes
-                    strokes.append(np.array((stroke_x, stroke_y, stroke_t)))
+                # Release processed elements so memory use stays flat
+                element.clear()
+                while element.getprevious() is not None:
+                    del element.getparent()[0]
+        except etree.ParseError as e:
+            raise ValueError(f"Invalid InkML format: {e}")
 
-        return Ink(strokes=strokes, annotations=annotations)
+        return Ink.from_strokes(strokes, annotations)
+    
+    @staticmethod
+    def _parse_trace(text: str) -> Optional[np.ndarray]:
+        """
+        Parse the text of a <trace> element into a stroke array.
+        
+        Args:
+            text: Comma-separated list of "x y t" points
+            
+        Returns:
+            Array of shape (3, number of points), or None if no valid points
+        """
+        # Converting the number strings dominates, and float() per value is
+        # as fast as any NumPy parser here; collect all values in one flat
+        # list and convert it to an array once
+        values = []
+        
+        for point in text.split(','):
+            try:
+                x, y, t = point.split(' ')
+                values += (float(x), float(y), float(t))
+            except ValueError:
+                continue  # Skip malformed points
+                
+        if not values:
+            return None
+        
+        return np.array(values, dtype=np.float32).reshape(-1, 3).T.copy()
     
     @staticmethod
     def get_bounding_box(ink: Ink) -> Optional[tuple]:
@@ -97,17 +224,46 @@ class InkProcessor:
         Returns:
             Tuple of (min_x, min_y, max_x, max_y) or None if no strokes
         """
-        if not ink.strokes:
+        if ink.points.shape[1] == 0:
             return None
             
-        all_x = []
-        all_y = []
+        min_xy = ink.points[:2].min(axis=1)
+        max_xy = ink.points[:2].max(axis=1)
+            
+        return (float(min_xy[0]), float(min_xy[1]), float(max_xy[0]), float(max_xy[1]))
+    
+    @staticmethod
+    def get_bounding_boxes(inks: List[Ink]) -> np.ndarray:
+        """
+        Calculate the bounding boxes of many inks in one vectorized pass.
         
-        for stroke in ink.strokes:
-            all_x.extend(stroke[0])  # x coordinates
-            all_y.extend(stroke[1])  # y coordinates
+        Args:
+            inks: List of Ink objects
             
-        return (min(all_x), min(all_y), max(all_x), max(all_y))
+        Returns:
+            Array with shape (len(inks), 4) of (min_x, min_y, max_x, max_y)
+            rows. Rows for inks without points are NaN.
+        """
+        boxes = np.full((len(inks), 4), np.nan)
+        
+        counts = np.fromiter((ink.points.shape[1] for ink in inks),
+                             dtype=np.int64, count=len(inks))
+        non_empty = counts > 0
+        if not non_empty.any():
+            return boxes
+        
+        # All x/y coordinates back to back; reduceat then reduces each
+        # ink's slice. Empty inks are left out, since reduceat does not
+        # produce empty reductions.
+        xy = np.concatenate([ink.points[:2] for ink, count in zip(inks, counts) if count],
+                            axis=1)
+        starts = np.zeros(int(non_empty.sum()), dtype=np.int64)
+        np.cumsum(counts[non_empty][:-1], out=starts[1:])
+        
+        boxes[non_empty, :2] = np.minimum.reduceat(xy, starts, axis=1).T
+        boxes[non_empty, 2:] = np.maximum.reduceat(xy, starts, axis=1).T
+        
+        return boxes
     
     @staticmethod
     def normalize_ink(ink: Ink, target_size: tuple = (256, 256)) -> Ink:
@@ -121,9 +277,6 @@ class InkProcessor:
         Returns:
             New Ink object with normalized coordinates
         """
-        if not ink.strokes:
-            return ink
-            
         bbox = InkProcessor.get_bounding_box(ink)
         if bbox is None:
             return ink
@@ -139,20 +292,24 @@ class InkProcessor:
         scale_y = target_size[1] / height
         scale = min(scale_x, scale_y)  # Maintain aspect ratio
         
-        normalized_strokes = []
-        for stroke in ink.strokes:
-            normalized_x = (stroke[0] - min_x) * scale
-            normalized_y = (stroke[1] - min_y) * scale
-            normalized_strokes.append(np.array([normalized_x, normalized_y, stroke[2]]))
+        # Shift and scale the x/y rows of all strokes at once, in place on
+        # a single copy so no per-stroke or temporary arrays are allocated.
+        # The copy is floating point, so integer coordinates can be scaled.
+        points = ink.points.astype(np.result_type(ink.points.dtype, np.float32), order='C')
+        xy = points[:2]
+        xy -= np.array([[min_x], [min_y]], dtype=points.dtype)
+        xy *= scale
             
-        return Ink(strokes=normalized_strokes, annotations=ink.annotations.copy())
+        return Ink(points=points,
+                   stroke_offsets=ink.stroke_offsets.copy(),
+                   annotations=ink.annotations.copy())
     
     @staticmethod
     def stroke_count(ink: Ink) -> int:
         """Get the number of strokes in the ink."""
-        return len(ink.strokes)
+        return len(ink.stroke_offsets) - 1
     
     @staticmethod
     def point_count(ink: Ink) -> int:
         """Get the total number of points across all strokes."""
-        return sum(stroke.shape[1] for stroke in ink.strokes)
\ No newline at end of file
+        return ink.points.shape[1]
\ No newline at end of file
@@ -15,7 +15,7 @@ __author__ = "La-Math-ex Team"
 # Import main components
 from .data.ink_processor import InkProcessor, Ink
 from .models.math_ocr import MathOCRModel
-from .visualization.ink_visualizer import InkVisualizer
+from .visualization.ink_visualizer import InkVisualizer, ReusableInkRenderer, InteractiveInkViewer
 from .ui.drawing_interface import DrawingInterface
 from .utils.data_downloader import DataDownloader
 
@@ -24,6 +24,8 @@ __all__ = [
     'Ink',
     'MathOCRModel',
     'InkVisualizer',
+    'ReusableInkRenderer',
+    'InteractiveInkViewer',
     'DrawingInterface',
     'DataDownloader'
 ]
\ No newline at end of file
@@ -5,13 +5,77 @@ This module provides functionality to convert handwritten mathematical
 expressions to LaTeX using TrOCR models.
 """
 
+import functools
+import editdistance
+from concurrent.futures import ThreadPoolExecutor
 import torch
 from transformers import TrOCRProcessor, VisionEncoderDecoderModel
 from PIL import Image
 import numpy as np
 from typing import Union, List, Optional
 import io
-import base64
+
+try:
+    from torchvision.transforms.v2 import functional as TF
+    from torchvision.transforms import InterpolationMode
+except ImportError:
+    TF = None
+
+try:
+    # SIMD-accelerated drop-in replacement for the standard base64 module
+    import pybase64 as base64
+except ImportError:
+    import base64
+
+
+@functools.lru_cache(maxsize=4)
+def _load_pretrained(model_name: str, device: str, backend: str = 'pytorch') -> tuple:
+    """
+    Load a TrOCR processor and model, caching them per (model_name, device, backend).
+    
+    Models are only used for inference, so instances created with the same
+    arguments can safely share the loaded weights. On CUDA devices the
+    PyTorch weights are cast to bfloat16 (float16 on GPUs without bf16
+    support) and the model is compiled with torch.compile. The
+    'onnxruntime' backend exports the model to ONNX and runs it with
+    ONNX Runtime.
+    
+    Args:
+        model_name: HuggingFace model identifier
+        device: Device to move the model to
+        backend: Inference backend ('pytorch' or 'onnxruntime')
+        
+    Returns:
+        Tuple of (processor, model)
+    """
+    # The fast (torchvision-backed) image processor resizes and normalizes
+    # in native code rather than in Python/NumPy
+    processor = TrOCRProcessor.from_pretrained(model_name, use_fast=True)
+    
+    if backend == 'onnxruntime':
+        try:
+            from optimum.onnxruntime import ORTModelForVision2Seq
+        except ImportError:
+            raise ImportError("optimum[onnxruntime] required for the onnxruntime backend")
+        
+        provider = 'CUDAExecutionProvider' if device.startswith('cuda') else 'CPUExecutionProvider'
+        model = ORTModelForVision2Seq.from_pretrained(model_name, export=True, provider=provider)
+        return processor, model
+    
+    model = VisionEncoderDecoderModel.from_pretrained(model_name)
+    model.to(device)
+    model.eval()
+    
+    if device.startswith('cuda'):
+        dtype = torch.bfloat16 if torch.cuda.is_bf16_supported() else torch.float16
+        model.to(dtype)
+        # Compiles in place so that generate() also uses the compiled forward.
+        # The default mode avoids CUDA graphs: with generate()'s dynamic KV
+        # cache every decode length is a new shape, and graphed outputs get
+        # overwritten by later replays.
+        model.compile(mode='default', fullgraph=False)
+    
+    return processor, model
 
 
 class MathOCRModel:
@@ -20,18 +84,28 @@ class MathOCRModel:
     """
     
     DEFAULT_MODEL = 'fhswf/TrOCR_Math_handwritten'
+    BACKENDS = ('pytorch', 'onnxruntime')
+    # Upper bound on generated tokens; LaTeX for a single expression is short
+    MAX_NEW_TOKENS = 128
     
     def __init__(self, 
                  model_name: str = None,
-                 device: str = None):
+                 device: str = None,
+                 backend: str = 'pytorch'):
         """
         Initialize the Math OCR model.
         
         Args:
             model_name: HuggingFace model identifier
             device: Device to use ('cuda', 'cpu', or None for auto)
+            backend: Inference backend ('pytorch', or 'onnxruntime' for
+                     faster CPU inference; requires optimum[onnxruntime])
         """
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Unsupported backend: {backend}")
+        
         self.model_name = model_name or self.DEFAULT_MODEL
+        self.backend = backend
         
         # Determine device
         if device is None:
@@ -41,17 +115,28 @@ class MathOCRModel:
         
         self.processor = None
         self.model = None
+        self.dtype = torch.float32
+        self._preprocess_params = None
         self._load_model()
     
     def _load_model(self):
         """Load the TrOCR processor and model."""
         print(f"Loading TrOCR model: {self.model_name}")
         print(f"Using device: {self.device}")
+        print(f"Using backend: {self.backend}")
         
         try:
-            self.processor = TrOCRProcessor.from_pretrained(self.model_name)
-            self.model = VisionEncoderDecoderModel.from_pretrained(self.model_name)
-            self.model.to(self.device)
+            self.processor, self.model = _load_pretrained(
+                self.model_name, self.device, self.backend
+            )
+            # Pixel values are fed in the dtype of the model weights
+            self.dtype = getattr(self.model, 'dtype', torch.float32)
+            
+            image_processor_class = type(self.processor.image_processor).__name__
+            if not image_processor_class.endswith('Fast'):
+                print(f"Fast image processor unavailable, using {image_processor_class}")
+            
+            self._preprocess_params = self._build_preprocess_params()
             print("Model loaded successfully")
             
         except Exception as e:
@@ -71,51 +156,40 @@ class MathOCRModel:
         Returns:
             LaTeX string, or (LaTeX string, confidence) if return_confidence=True
         """
-        # Handle different image input types
-        if isinstance(image, str):
-            # File path
-            pil_image = Image.open(image).convert("RGB")
-        elif isinstance(image, np.ndarray):
-            # Numpy array
-            pil_image = Image.fromarray(image).convert("RGB")
-        elif isinstance(image, Image.Image):
-            # PIL Image
-            pil_image = image.convert("RGB")
-        else:
-            raise ValueError(f"Unsupported image type: {type(image)}")
+        pil_image = self._to_pil(image)
         
         # Process image
-        pixel_values = self.processor(
-            images=pil_image, 
-            return_tensors="pt"
-        ).pixel_values.to(self.device)
+        pixel_values = self._preprocess_single(pil_image)
         
         # Generate prediction
-        with torch.no_grad():
+        with torch.inference_mode():
             if return_confidence:
                 generated_ids = self.model.generate(
                     pixel_values, 
                     return_dict_in_generate=True,
-                    output_scores=True
+                    output_scores=True,
+                    **self._generation_kwargs()
                 )
                 generated_text = self.processor.batch_decode(
                     generated_ids.sequences, 
                     skip_special_tokens=True
                 )[0]
                 
-                # Calculate confidence (simplified approach)
+                # Calculate confidence (simplified approach): mean over decode
+                # steps of the most likely token's probability
                 scores = generated_ids.scores
                 if scores:
-                    confidence = torch.mean(torch.stack([
-                        torch.max(torch.softmax(score, dim=-1)) 
-                        for score in scores
-                    ])).item()
+                    step_scores = torch.stack(scores, dim=0).float()  # (steps, batch, vocab)
+                    confidence = torch.softmax(step_scores, dim=-1).amax(dim=-1).mean().item()
                 else:
                     confidence = 0.0
                 
                 return generated_text, confidence
             else:
-                generated_ids = self.model.generate(pixel_values)
+                generated_ids = self.model.generate(
+                    pixel_values,
+                    **self._generation_kwargs()
+                )
                 generated_text = self.processor.batch_decode(
                     generated_ids, 
                     skip_special_tokens=True
@@ -136,23 +210,245 @@ class MathOCRModel:
             List of LaTeX strings
         """
         results = []
+        starts = range(0, len(images), batch_size)
+        copy_stream = torch.cuda.Stream(device=self.device) if self.device.startswith('cuda') else None
         
-        for i in range(0, len(images), batch_size):
-            batch = images[i:i + batch_size]
-            batch_results = []
+        # Preprocess the next batch on a worker thread while the model is
+        # generating the current one
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            future = None
+            if starts:
+                future = executor.submit(self._prepare_batch, images[:batch_size], 0)
             
-            for image in batch:
+            for i in starts:
+                batch_results = [""] * len(images[i:i + batch_size])
+                
                 try:
-                    result = self.predict_from_image(image)
-                    batch_results.append(result)
+                    valid_indices, pixel_values = future.result()
                 except Exception as e:
-                    print(f"Error processing image {i}: {e}")
-                    batch_results.append("")
-            
-            results.extend(batch_results)
+                    print(f"Error processing batch starting at image {i}: {e}")
+                    valid_indices, pixel_values = [], None
+                
+                next_start = i + batch_size
+                if next_start < len(images):
+                    future = executor.submit(
+                        self._prepare_batch,
+                        images[next_start:next_start + batch_size],
+                        next_start
+                    )
+                
+                if pixel_values is not None:
+                    try:
+                        pixel_values = self._to_device(pixel_values, copy_stream)
+                        
+                        with torch.inference_mode():
+                            generated_ids = self.model.generate(
+                                pixel_values,
+                                **self._generation_kwargs()
+                            )
+                        generated_texts = self.processor.batch_decode(
+                            generated_ids,
+                            skip_special_tokens=True
+                        )
+                        
+                        for j, text in zip(valid_indices, generated_texts):
+                            batch_results[j] = text
+                    except Exception as e:
+                        print(f"Error processing batch starting at image {i}: {e}")
+                
+                results.extend(batch_results)
         
         return results
     
+    def _build_preprocess_params(self) -> Optional[dict]:
+        """
+        Precompute the constants of the specialized single-image preprocessing.
+        
+        TrOCR image processors always resize to a fixed size, rescale and
+        normalize, so the work can be done directly with torchvision on the
+        model device instead of going through the generic processor call.
+        
+        Returns:
+            Dictionary of preprocessing constants, or None if the image
+            processor does something this path doesn't replicate
+        """
+        if TF is None:
+            return None
+        
+        image_processor = self.processor.image_processor
+        size = getattr(image_processor, 'size', None)
+        try:
+            # Slow processors store a dict, fast ones a SizeDict
+            height, width = size['height'], size['width']
+        except (KeyError, TypeError):
+            return None
+        
+        interpolations = {
+            2: InterpolationMode.BILINEAR,
+            3: InterpolationMode.BICUBIC,
+        }
+        resample = getattr(image_processor, 'resample', None)
+        resample = int(resample) if resample is not None else None
+        
+        if not (getattr(image_processor, 'do_resize', False)
+                and getattr(image_processor, 'do_rescale', False)
+                and getattr(image_processor, 'do_normalize', False)
+                and height and width
+                and resample in interpolations):
+            return None
+        
+        def as_tensor(values):
+            return torch.tensor(values, device=self.device, dtype=torch.float32).view(1, -1, 1, 1)
+        
+        return {
+            "size": [height, width],
+            "interpolation": interpolations[resample],
+            "rescale_factor": float(image_processor.rescale_factor),
+            "mean": as_tensor(image_processor.image_mean),
+            "std": as_tensor(image_processor.image_std),
+        }
+    
+    def _preprocess_single(self, pil_image: Image.Image) -> torch.Tensor:
+        """
+        Turn one RGB PIL image into model-ready pixel values.
+        
+        Args:
+            pil_image: RGB PIL image
+            
+        Returns:
+            Pixel values on the model device, in the model dtype
+        """
+        params = self._preprocess_params
+        if params is None or params["mean"].shape[1] != len(pil_image.getbands()):
+            return self.processor(
+                images=pil_image,
+                return_tensors="pt"
+            ).pixel_values.to(self.device, dtype=self.dtype, non_blocking=True)
+        
+        pixel_values = TF.pil_to_tensor(pil_image).unsqueeze(0)
+        pixel_values = pixel_values.to(self.device, non_blocking=True).float()
+        pixel_values = TF.resize(
+            pixel_values,
+            params["size"],
+            interpolation=params["interpolation"],
+            antialias=True
+        )
+        pixel_values.mul_(params["rescale_factor"]).sub_(params["mean"]).div_(params["std"])
+        
+        return pixel_values.to(self.dtype)
+    
+    def _generation_kwargs(self) -> dict:
+        """
+        Get the keyword arguments passed to generate().
+        
+        Greedy decoding with a bounded output length stops as soon as every
+        sequence emits EOS, instead of running up to the model's max_length.
+        
+        Returns:
+            Dictionary of generation arguments
+        """
+        return {
+            "max_new_tokens": self.MAX_NEW_TOKENS,
+            "num_beams": 1,
+            "do_sample": False,
+            "use_cache": True,
+            "pad_token_id": self.processor.tokenizer.pad_token_id,
+        }
+    
+    def _prepare_batch(self, 
+                       batch: List[Union[Image.Image, np.ndarray, str]],
+                       start: int) -> tuple:
+        """
+        Load and preprocess a batch of images on the CPU.
+        
+        Args:
+            batch: Images in the batch
+            start: Index of the first image of the batch in the full input
+            
+        Returns:
+            Tuple of (indices of images that loaded, pixel values or None)
+        """
+        # Load every image first so one bad input doesn't fail the batch
+        pil_images = []
+        valid_indices = []
+        for j, image in enumerate(batch):
+            try:
+                pil_images.append(self._to_pil(image))
+                valid_indices.append(j)
+            except Exception as e:
+                print(f"Error processing image {start + j}: {e}")
+        
+        if not pil_images:
+            return valid_indices, None
+        
+        pixel_values = self.processor(
+            images=pil_images,
+            return_tensors="pt"
+        ).pixel_values
+        
+        # Page-locked memory allows an asynchronous host-to-device copy
+        if self.device.startswith('cuda'):
+            pixel_values = pixel_values.pin_memory()
+        
+        return valid_indices, pixel_values
+    
+    def _to_device(self, 
+                   pixel_values: torch.Tensor,
+                   copy_stream: Optional["torch.cuda.Stream"] = None) -> torch.Tensor:
+        """
+        Move pixel values to the model device and dtype.
+        
+        Args:
+            pixel_values: Preprocessed pixel values on the CPU
+            copy_stream: CUDA stream to issue the copy on (None for a plain copy)
+            
+        Returns:
+            Pixel values ready for the model
+        """
+        if copy_stream is None:
+            return pixel_values.to(self.device, dtype=self.dtype)
+        
+        with torch.cuda.stream(copy_stream):
+            pixel_values = pixel_values.to(self.device, dtype=self.dtype, non_blocking=True)
+        
+        compute_stream = torch.cuda.current_stream(self.device)
+        compute_stream.wait_stream(copy_stream)
+        # Keep the allocator from reusing the memory before compute is done
+        pixel_values.record_stream(compute_stream)
+        
+        return pixel_values
+    
+    @staticmethod
+    def _to_pil(image: Union[Image.Image, np.ndarray, str]) -> Image.Image:
+        """
+        Convert a supported image input to an RGB PIL image.
+        
+        Args:
+            image: PIL Image, numpy array, or file path
+            
+        Returns:
+            RGB PIL image
+            
+        Raises:
+            ValueError: If the image type is not supported
+        """
+        if isinstance(image, str):
+            # File path
+            return MathOCRModel._to_rgb(Image.open(image))
+        elif isinstance(image, np.ndarray):
+            # Numpy array
+            return MathOCRModel._to_rgb(Image.fromarray(image))
+        elif isinstance(image, Image.Image):
+            # PIL Image
+            return MathOCRModel._to_rgb(image)
+        else:
+            raise ValueError(f"Unsupported image type: {type(image)}")
+    
+    @staticmethod
+    def _to_rgb(image: Image.Image) -> Image.Image:
+        """Convert a PIL image to RGB, skipping the copy if it already is."""
+        return image if image.mode == "RGB" else image.convert("RGB")
+    
     def predict_from_base64(self, base64_data: str) -> str:
         """
         Convert base64 encoded image to LaTeX.
@@ -164,16 +460,10 @@ class MathOCRModel:
             LaTeX string
         """
         # Remove header if present
-        if "," in base64_data:
-            header, encoded = base64_data.split(",", 1)
-        else:
-            encoded = base64_data
+        header, _, encoded = base64_data.rpartition(",")
         
-        # Decode base64 data
-        decoded_data = base64.b64decode(encoded)
-        
-        # Create PIL image
-        image = Image.open(io.BytesIO(decoded_data))
+        # Decode base64 data straight into the buffer PIL reads from
+        image = Image.open(io.BytesIO(base64.b64decode(encoded)))
         
         return self.predict_from_image(image)
     
@@ -200,28 +490,22 @@ class MathOCRModel:
                           if pred.strip() == gt.strip())
         accuracy = exact_matches / len(predictions)
         
-        # Calculate character-level accuracy (simplified)
-        char_correct = 0
+        # Calculate character error rate from edit distances
+        total_edits = 0
         total_chars = 0
         
         for pred, gt in zip(predictions, ground_truth):
-            pred_clean = pred.strip()
             gt_clean = gt.strip()
-            
-            # Simple character matching
-            for p, g in zip(pred_clean, gt_clean):
-                if p == g:
-                    char_correct += 1
-                total_chars += 1
-            
-            # Account for length differences
-            total_chars += abs(len(pred_clean) - len(gt_clean))
+            total_edits += editdistance.eval(pred.strip(), gt_clean)
+            total_chars += len(gt_clean)
         
-        char_accuracy = char_correct / total_chars if total_chars > 0 else 0
+        char_error_rate = total_edits / total_chars if total_chars > 0 else 0
+        char_accuracy = max(0.0, 1 - char_error_rate) if total_chars > 0 else 0
         
         return {
             "exact_match_accuracy": accuracy,
             "character_accuracy": char_accuracy,
+            "character_error_rate": char_error_rate,
             "total_samples": len(predictions),
             "exact_matches": exact_matches
         }
@@ -236,6 +520,7 @@ class MathOCRModel:
         return {
             "model_name": self.model_name,
             "device": self.device,
+            "backend": self.backend,
             "processor_class": type(self.processor).__name__,
             "model_class": type(self.model).__name__,
             "model_loaded": self.model is not None
@@ -243,4 +528,5 @@ class MathOCRModel:
     
     def __repr__(self) -> str:
         """String representation of the model."""
-        return f"MathOCRModel(model='{self.model_name}', device='{self.device}')"
\ No newline at end of file
+        return (f"MathOCRModel(model='{self.model_name}', device='{self.device}', "
+                f"backend='{self.backend}')")
\ No newline at end of file
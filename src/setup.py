@@ -54,6 +54,9 @@ setup(
             "sphinx>=5.0",
             "sphinx-rtd-theme>=1.0",
         ],
+        "onnx": [
+            "optimum[onnxruntime]>=1.16.0",
+        ],
     },
     entry_points={
         "console_scripts": [
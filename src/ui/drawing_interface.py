@@ -6,11 +6,240 @@ handwritten mathematical expressions.
 """
 
 import base64
+import functools
+import string
 from IPython.display import display, HTML
 from PIL import Image
 import io
-from typing import Optional, Callable
+from typing import Optional, Callable, Tuple
 import os
+from ..utils.image_utils import ImageProcessor
+
+
+# Drawing pad page; filled in by DrawingInterface.create_drawing_pad
+_PAD_TEMPLATE = string.Template("""
+<!DOCTYPE html>
+<html>
+<head>
+    <title>${title}</title>
+    <style>
+        #drawingCanvas {
+            border: 2px solid #333;
+            cursor: crosshair;
+            background-color: ${background_color};
+            /* Own compositing layer; strokes never trigger page layout */
+            width: ${canvas_width}px;
+            height: ${canvas_height}px;
+            will-change: transform;
+            transform: translateZ(0);
+            contain: layout paint size;
+        }
+        .controls {
+            margin: 10px 0;
+            padding: 10px;
+            background: #f0f0f0;
+            border-radius: 5px;
+        }
+        .controls button {
+            margin: 5px;
+            padding: 8px 16px;
+            border: none;
+            border-radius: 3px;
+            cursor: pointer;
+            font-size: 14px;
+        }
+        .controls button:hover {
+            opacity: 0.8;
+        }
+        #clearBtn { background: #ff4444; color: white; }
+        #saveBtn { background: #4444ff; color: white; }
+        #undoBtn { background: #44ff44; color: black; }
+    </style>
+</head>
+<body>
+    <h3>${title}</h3>
+    <canvas id="drawingCanvas" width="${canvas_width}" height="${canvas_height}"></canvas>
+    <div class="controls">
+        ${color_picker_html}
+        ${size_slider_html}
+        <button id="clearBtn" onclick="clearCanvas()">Clear</button>
+        <button id="undoBtn" onclick="undoLast()">Undo</button>
+        <button id="saveBtn" onclick="saveDrawing()">Save Drawing</button>
+    </div>
+
+    <script>
+        const canvas = document.getElementById('drawingCanvas');
+        const ctx = canvas.getContext('2d');
+        let isDrawing = false;
+        let strokes = [];
+        let currentStroke = [];
+        // Points are queued by mouse events and painted once per frame
+        let rafPending = false;
+        let dirtyFrom = 0;
+
+        ctx.lineCap = 'round';
+        ctx.lineJoin = 'round';
+
+        // Committed strokes are kept pre-rendered on an offscreen
+        // canvas so repaints are a single blit
+        const offscreen = document.createElement('canvas');
+        offscreen.width = canvas.width;
+        offscreen.height = canvas.height;
+        const offCtx = offscreen.getContext('2d');
+        offCtx.lineCap = 'round';
+        offCtx.lineJoin = 'round';
+
+        // Look the brush controls up once and only touch the context
+        // when they change, instead of reading them on every paint
+        const colorPicker = document.getElementById('brushColor');
+        const sizePicker = document.getElementById('brushSize');
+        ctx.strokeStyle = colorPicker ? colorPicker.value : '${brush_color}';
+        ctx.lineWidth = sizePicker ? +sizePicker.value : ${brush_size};
+
+        // Slider drags fire many 'input' events per frame; apply only
+        // the latest one on the next animation frame
+        function rafThrottle(fn) {
+            let pending = false;
+            let lastArgs;
+            return (...args) => {
+                lastArgs = args;
+                if (pending) return;
+                pending = true;
+                requestAnimationFrame(() => {
+                    pending = false;
+                    fn(...lastArgs);
+                });
+            };
+        }
+
+        if (colorPicker) colorPicker.addEventListener('input', rafThrottle(e => { ctx.strokeStyle = e.target.value; }));
+        if (sizePicker) sizePicker.addEventListener('input', rafThrottle(e => { ctx.lineWidth = +e.target.value; }));
+
+        canvas.addEventListener('mousedown', startDrawing);
+        canvas.addEventListener('mousemove', draw);
+        canvas.addEventListener('mouseup', stopDrawing);
+        canvas.addEventListener('mouseout', stopDrawing);
+
+        function startDrawing(e) {
+            isDrawing = true;
+            currentStroke = [];
+            dirtyFrom = 0;
+            const rect = canvas.getBoundingClientRect();
+            const x = e.clientX - rect.left;
+            const y = e.clientY - rect.top;
+            currentStroke.push({x: x, y: y});
+        }
+
+        function draw(e) {
+            if (!isDrawing) return;
+
+            const rect = canvas.getBoundingClientRect();
+            const x = e.clientX - rect.left;
+            const y = e.clientY - rect.top;
+
+            currentStroke.push({x: x, y: y});
+
+            if (!rafPending) {
+                rafPending = true;
+                requestAnimationFrame(flush);
+            }
+        }
+
+        function flush() {
+            rafPending = false;
+            if (dirtyFrom >= currentStroke.length) return;
+
+            // Continue from the last painted point of the stroke
+            const start = currentStroke[Math.max(dirtyFrom - 1, 0)];
+            ctx.beginPath();
+            ctx.moveTo(start.x, start.y);
+            for (let i = dirtyFrom; i < currentStroke.length; i++) {
+                ctx.lineTo(currentStroke[i].x, currentStroke[i].y);
+            }
+            ctx.stroke();
+
+            dirtyFrom = currentStroke.length;
+        }
+
+        function stopDrawing() {
+            if (isDrawing && currentStroke.length > 0) {
+                flush();  // Paint points still waiting for a frame
+                const stroke = {
+                    points: [...currentStroke],
+                    color: ctx.strokeStyle,
+                    width: ctx.lineWidth
+                };
+                strokes.push(stroke);
+                renderStroke(offCtx, stroke);
+            }
+            isDrawing = false;
+        }
+
+        function renderStroke(target, stroke) {
+            const points = stroke.points;
+            target.strokeStyle = stroke.color;
+            target.lineWidth = stroke.width;
+            target.beginPath();
+            target.moveTo(points[0].x, points[0].y);
+
+            for (let i = 1; i < points.length; i++) {
+                target.lineTo(points[i].x, points[i].y);
+            }
+            target.stroke();
+        }
+
+        function clearCanvas() {
+            ctx.clearRect(0, 0, canvas.width, canvas.height);
+            offCtx.clearRect(0, 0, offscreen.width, offscreen.height);
+            strokes = [];
+            currentStroke = [];
+            dirtyFrom = 0;
+        }
+
+        function undoLast() {
+            if (strokes.length > 0) {
+                strokes.pop();
+
+                // Re-render the remaining strokes into the buffer once
+                offCtx.clearRect(0, 0, offscreen.width, offscreen.height);
+                for (const stroke of strokes) {
+                    renderStroke(offCtx, stroke);
+                }
+                redrawCanvas();
+            }
+        }
+
+        function redrawCanvas() {
+            ctx.clearRect(0, 0, canvas.width, canvas.height);
+            ctx.drawImage(offscreen, 0, 0);
+        }
+
+        function saveDrawing() {
+            const dataURL = canvas.toDataURL('image/png');
+
+            if (typeof google !== 'undefined' && google.colab) {
+                google.colab.kernel.invokeFunction('notebook.save_image', [dataURL], {});
+            } else {
+                const link = document.createElement('a');
+                link.download = 'drawing.png';
+                link.href = dataURL;
+                link.click();
+            }
+        }
+    </script>
+</body>
+</html>
+""")
+
+_COLOR_PICKER_TEMPLATE = string.Template("""
+    Color:
+    <input type="color" id="brushColor" value="${brush_color}">
+""")
+
+_SIZE_SLIDER_TEMPLATE = string.Template("""
+    Size:
+    <input type="range" id="brushSize" min="1" max="20" value="${brush_size}">
+""")
 
 
 class DrawingInterface:
@@ -57,173 +286,46 @@ class DrawingInterface:
             HTML object for display in Jupyter notebooks
         """
         # Color picker HTML
-        color_picker_html = f"""
-            Color:
-            <input type="color" id="brushColor" value="{self.default_brush_color}">
-        """ if enable_color_picker else ""
+        color_picker_html = _COLOR_PICKER_TEMPLATE.substitute(
+            brush_color=self.default_brush_color
+        ) if enable_color_picker else ""
         
         # Size slider HTML
-        size_slider_html = f"""
-            Size:
-            <input type="range" id="brushSize" min="1" max="20" value="{self.default_brush_size}">
-        """ if enable_size_slider else ""
+        size_slider_html = _SIZE_SLIDER_TEMPLATE.substitute(
+            brush_size=self.default_brush_size
+        ) if enable_size_slider else ""
         
-        html_code = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <title>{title}</title>
-            <style>
-                #drawingCanvas {{
-                    border: 2px solid #333;
-                    cursor: crosshair;
-                    background-color: {self.background_color};
-                }}
-                .controls {{
-                    margin: 10px 0;
-                    padding: 10px;
-                    background: #f0f0f0;
-                    border-radius: 5px;
-                }}
-                .controls button {{
-                    margin: 5px;
-                    padding: 8px 16px;
-                    border: none;
-                    border-radius: 3px;
-                    cursor: pointer;
-                    font-size: 14px;
-                }}
-                .controls button:hover {{
-                    opacity: 0.8;
-                }}
-                #clearBtn {{ background: #ff4444; color: white; }}
-                #saveBtn {{ background: #4444ff; color: white; }}
-                #undoBtn {{ background: #44ff44; color: black; }}
-            </style>
-        </head>
-        <body>
-            <h3>{title}</h3>
-            <canvas id="drawingCanvas" width="{self.canvas_width}" height="{self.canvas_height}"></canvas>
-            <div class="controls">
-                {color_picker_html}
-                {size_slider_html}
-                <button id="clearBtn" onclick="clearCanvas()">Clear</button>
-                <button id="undoBtn" onclick="undoLast()">Undo</button>
-                <button id="saveBtn" onclick="saveDrawing()">Save Drawing</button>
-            </div>
-
-            <script>
-                const canvas = document.getElementById('drawingCanvas');
-                const ctx = canvas.getContext('2d');
-                let isDrawing = false;
-                let strokes = [];
-                let currentStroke = [];
-
-                ctx.lineCap = 'round';
-                ctx.lineJoin = 'round';
-
-                canvas.addEventListener('mousedown', startDrawing);
-                canvas.addEventListener('mousemove', draw);
-                canvas.addEventListener('mouseup', stopDrawing);
-                canvas.addEventListener('mouseout', stopDrawing);
-
-                function startDrawing(e) {{
-                    isDrawing = true;
-                    currentStroke = [];
-                    const rect = canvas.getBoundingClientRect();
-                    const x = e.clientX - rect.left;
-                    const y = e.clientY - rect.top;
-                    ctx.beginPath();
-                    ctx.moveTo(x, y);
-                    currentStroke.push({{x: x, y: y}});
-                }}
-
-                function draw(e) {{
-                    if (!isDrawing) return;
-                    
-                    const rect = canvas.getBoundingClientRect();
-                    const x = e.clientX - rect.left;
-                    const y = e.clientY - rect.top;
-                    
-                    const colorPicker = document.getElementById('brushColor');
-                    const sizePicker = document.getElementById('brushSize');
-                    
-                    if (colorPicker) ctx.strokeStyle = colorPicker.value;
-                    if (sizePicker) ctx.lineWidth = sizePicker.value;
-                    
-                    ctx.lineTo(x, y);
-                    ctx.stroke();
-                    
-                    currentStroke.push({{x: x, y: y}});
-                }}
-
-                function stopDrawing() {{
-                    if (isDrawing && currentStroke.length > 0) {{
-                        strokes.push([...currentStroke]);
-                    }}
-                    isDrawing = false;
-                }}
-
-                function clearCanvas() {{
-                    ctx.clearRect(0, 0, canvas.width, canvas.height);
-                    strokes = [];
-                    currentStroke = [];
-                }}
-
-                function undoLast() {{
-                    if (strokes.length > 0) {{
-                        strokes.pop();
-                        redrawCanvas();
-                    }}
-                }}
-
-                function redrawCanvas() {{
-                    ctx.clearRect(0, 0, canvas.width, canvas.height);
-                    
-                    for (const stroke of strokes) {{
-                        if (stroke.length > 0) {{
-                            ctx.beginPath();
-                            ctx.moveTo(stroke[0].x, stroke[0].y);
-                            
-                            for (let i = 1; i < stroke.length; i++) {{
-                                ctx.lineTo(stroke[i].x, stroke[i].y);
-                            }}
-                            ctx.stroke();
-                        }}
-                    }}
-                }}
-
-                function saveDrawing() {{
-                    const dataURL = canvas.toDataURL('image/png');
-                    
-                    if (typeof google !== 'undefined' && google.colab) {{
-                        google.colab.kernel.invokeFunction('notebook.save_image', [dataURL], {{}});
-                    }} else {{
-                        const link = document.createElement('a');
-                        link.download = 'drawing.png';
-                        link.href = dataURL;
-                        link.click();
-                    }}
-                }}
-            </script>
-        </body>
-        </html>
-        """
+        html_code = _PAD_TEMPLATE.substitute(
+            title=title,
+            background_color=self.background_color,
+            canvas_width=self.canvas_width,
+            canvas_height=self.canvas_height,
+            color_picker_html=color_picker_html,
+            size_slider_html=size_slider_html,
+            brush_color=self.default_brush_color,
+            brush_size=self.default_brush_size
+        )
         
         return HTML(html_code)
     
-    def register_save_callback(self, callback_func: Optional[Callable] = None):
+    def register_save_callback(self, callback_func: Optional[Callable] = None,
+                               palette_colors: Optional[int] = 16):
         """
         Register a callback function for saving drawings.
         
         Args:
             callback_func: Function to call when saving (default uses built-in)
+            palette_colors: Number of palette colors the built-in callback
+                            quantizes PNG output to. Pass None to write the
+                            canvas PNG as-is, which skips decoding and
+                            re-encoding the image but keeps the larger file.
         """
         try:
             from google.colab import output
             
             if callback_func is None:
-                callback_func = self._default_save_callback
+                callback_func = functools.partial(self._default_save_callback,
+                                                  palette_colors=palette_colors)
             
             output.register_callback('notebook.save_image', callback_func)
             self.callback_registered = True
@@ -232,20 +334,46 @@ class DrawingInterface:
         except ImportError:
             print("Google Colab not detected. Save callback not registered.")
     
-    def _default_save_callback(self, data_url: str, filename: str = "drawing.png"):
+    def _default_save_callback(self, data_url: str, filename: str = "drawing.png",
+                               palette_colors: Optional[int] = 16):
         """
         Default callback for saving drawings.
         
         Args:
             data_url: Base64 encoded image data URL
             filename: Output filename
+            palette_colors: Number of palette colors for PNG output (None to
+                            keep full color). Drawings only use a handful of
+                            colors, so a small palette shrinks the file a lot.
+                            With None, PNG data is written to a .png file
+                            as-is, without decoding it.
         """
         try:
-            header, encoded = data_url.split(",", 1)
-            decoded_data = base64.b64decode(encoded)
+            # Encoding the URL copies it once; decoding from a view of the
+            # payload saves the second copy that slicing the string first
+            # (and having b64decode encode the slice) would make
+            comma = data_url.find(",")
+            header = data_url[:comma]
+            decoded_data = base64.b64decode(memoryview(data_url.encode("ascii"))[comma + 1:])
+            
+            is_png = filename.lower().endswith(".png")
+            
+            if palette_colors is None and is_png and header.startswith("data:image/png"):
+                # The canvas already produced a PNG; nothing to re-encode
+                with open(filename, "wb") as f:
+                    f.write(decoded_data)
+                print(f"Successfully saved drawing as '{filename}'!")
+                print("Look for it in the file browser.")
+                return
             
             image = Image.open(io.BytesIO(decoded_data))
-            image.save(filename)
+            
+            if palette_colors and is_png:
+                image = image.convert("P", palette=Image.Palette.ADAPTIVE,
+                                      colors=palette_colors)
+                image.save(filename, optimize=True)
+            else:
+                image.save(filename)
             
             print(f"Successfully saved drawing as '{filename}'!")
             print("Look for it in the file browser.")
@@ -253,12 +381,15 @@ class DrawingInterface:
         except Exception as e:
             print(f"Error saving image: {e}")
     
-    def load_image_from_file(self, filepath: str) -> Image.Image:
+    def load_image_from_file(self, filepath: str,
+                             target_size: Optional[Tuple[int, int]] = None) -> Image.Image:
         """
         Load an image from file for processing.
         
         Args:
             filepath: Path to image file
+            target_size: Size the image will be scaled down to, if known;
+                         lets large JPEGs be decoded at a reduced scale
             
         Returns:
             PIL Image object
@@ -269,7 +400,7 @@ class DrawingInterface:
         if not os.path.exists(filepath):
             raise FileNotFoundError(f"Image file not found: {filepath}")
         
-        return Image.open(filepath).convert("RGB")
+        return ImageProcessor.load_image(filepath, target_size)
     
     def get_canvas_info(self) -> dict:
         """
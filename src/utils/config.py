@@ -5,9 +5,12 @@ This module provides configuration settings and constants used throughout
 the package.
 """
 
+import copy
+import functools
+import json
 import os
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Tuple
 
 
 class Config:
@@ -54,6 +57,12 @@ class Config:
         "color_scheme": "tab10"
     }
     
+    # Directory keys under 'paths'
+    DIRECTORY_KEYS = ('data_dir', 'models_dir', 'output_dir', 'cache_dir')
+    
+    # Parsed YAML config files, keyed by (absolute path, modification time)
+    _file_cache: Dict[Tuple[str, int], Dict[str, Any]] = {}
+    
     def __init__(self, config_file: str = None):
         """
         Initialize configuration.
@@ -65,6 +74,20 @@ class Config:
         
         if config_file and os.path.exists(config_file):
             self._load_config_file(config_file)
+        
+        self._refresh_directories()
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=128)
+    def _split_key(key: str) -> Tuple[str, ...]:
+        """Split a dotted configuration key, memoized across calls."""
+        return tuple(key.split('.'))
+    
+    def _refresh_directories(self):
+        """Cache the configured directory paths read by the directory properties."""
+        self._directories = {
+            dir_key: self.get(f'paths.{dir_key}') for dir_key in self.DIRECTORY_KEYS
+        }
     
     def _load_default_config(self) -> Dict[str, Any]:
         """Load default configuration settings."""
@@ -86,23 +109,38 @@ class Config:
         """
         Load configuration from file.
         
+        YAML files are only parsed again when they have been modified since
+        they were last loaded. JSON files are read every time, since
+        json.load is cheaper than copying a cached result.
+        
         Args:
             config_file: Path to configuration file (JSON or YAML)
         """
-        import json
-        
-        with open(config_file, 'r') as f:
-            if config_file.endswith('.yaml') or config_file.endswith('.yml'):
-                try:
-                    import yaml
-                    file_config = yaml.safe_load(f)
-                except ImportError:
-                    raise ImportError("PyYAML required for YAML config files")
-            else:
-                file_config = json.load(f)
+        path = os.path.abspath(config_file)
         
-        # Update configuration
-        self._deep_update(self._config, file_config)
+        if not (path.endswith('.yaml') or path.endswith('.yml')):
+            with open(path, 'r') as f:
+                self._deep_update(self._config, json.load(f))
+            return
+        
+        cache_key = (path, os.stat(path).st_mtime_ns)
+        file_config = self._file_cache.get(cache_key)
+        
+        if file_config is None:
+            try:
+                import yaml
+            except ImportError:
+                raise ImportError("PyYAML required for YAML config files")
+            with open(path, 'r') as f:
+                # Use the libyaml-based loader when PyYAML was built with it
+                loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+                file_config = yaml.load(f, Loader=loader)
+            
+            self._file_cache[cache_key] = file_config
+        
+        # Update configuration with a copy, so no two configs share nested
+        # values with the cache
+        self._deep_update(self._config, copy.deepcopy(file_config))
     
     def _deep_update(self, base_dict: dict, update_dict: dict):
         """Recursively update nested dictionary."""
@@ -123,7 +161,7 @@ class Config:
         Returns:
             Configuration value
         """
-        keys = key.split('.')
+        keys = self._split_key(key)
         value = self._config
         
         for k in keys:
@@ -142,7 +180,7 @@ class Config:
             key: Configuration key (e.g., 'models.handwritten_math')
             value: Value to set
         """
-        keys = key.split('.')
+        keys = self._split_key(key)
         config = self._config
         
         for k in keys[:-1]:
@@ -151,6 +189,9 @@ class Config:
             config = config[k]
         
         config[keys[-1]] = value
+        
+        if keys[0] == 'paths':
+            self._refresh_directories()
     
     def save_config(self, filepath: str):
         """
@@ -159,36 +200,34 @@ class Config:
         Args:
             filepath: Output file path
         """
-        import json
-        
         with open(filepath, 'w') as f:
             json.dump(self._config, f, indent=2)
     
     def create_directories(self):
         """Create necessary directories."""
-        for dir_key in ['data_dir', 'models_dir', 'output_dir', 'cache_dir']:
-            dir_path = Path(self.get(f'paths.{dir_key}'))
+        for dir_key in self.DIRECTORY_KEYS:
+            dir_path = Path(self._directories[dir_key])
             dir_path.mkdir(parents=True, exist_ok=True)
     
     @property
     def data_dir(self) -> str:
         """Get data directory path."""
-        return self.get('paths.data_dir')
+        return self._directories['data_dir']
     
     @property
     def models_dir(self) -> str:
         """Get models directory path."""
-        return self.get('paths.models_dir')
+        return self._directories['models_dir']
     
     @property
     def output_dir(self) -> str:
         """Get output directory path."""
-        return self.get('paths.output_dir')
+        return self._directories['output_dir']
     
     @property
     def cache_dir(self) -> str:
         """Get cache directory path."""
-        return self.get('paths.cache_dir')
+        return self._directories['cache_dir']
 
 
 # Global configuration instance
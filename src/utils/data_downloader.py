@@ -7,7 +7,11 @@ datasets, particularly the MathWriting dataset.
 
 import os
 import tarfile
+import tempfile
 import requests
+import urllib3
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from typing import Optional
 import shutil
 from pathlib import Path
@@ -19,6 +23,7 @@ class DataDownloader:
     """
     
     MATHWRITING_URL = "https://storage.googleapis.com/mathwriting_data/mathwriting-2024.tgz"
+    CHUNK_SIZE = 1 << 20  # 1 MiB
     
     def __init__(self, data_dir: str = "data"):
         """
@@ -30,12 +35,17 @@ class DataDownloader:
         self.data_dir = Path(data_dir)
         self.data_dir.mkdir(exist_ok=True)
     
-    def download_mathwriting_dataset(self, force_download: bool = False) -> str:
+    def download_mathwriting_dataset(self, force_download: bool = False,
+                                     connections: int = 1) -> str:
         """
         Download and extract the MathWriting 2024 dataset.
         
         Args:
             force_download: Whether to re-download if already exists
+            connections: Number of parallel HTTP range requests to use. With
+                         a single connection the archive is extracted while
+                         it streams in; with more, it is first downloaded to
+                         disk (if the server supports range requests).
             
         Returns:
             Path to the extracted dataset directory
@@ -52,38 +62,136 @@ class DataDownloader:
             print(f"MathWriting dataset already exists at: {dataset_dir}")
             return str(dataset_dir)
         
-        # Download the dataset
-        print("Downloading MathWriting dataset...")
+        # Extract into a scratch directory and only move the result into
+        # place once extraction has finished, so an interrupted download
+        # never leaves a partial dataset behind that looks complete
+        staging_dir = Path(tempfile.mkdtemp(prefix='.mathwriting-2024-', dir=self.data_dir))
+        
         try:
-            response = requests.get(self.MATHWRITING_URL, stream=True)
-            response.raise_for_status()
+            total_size = None
+            if connections > 1:
+                total_size = self._get_ranged_size(self.MATHWRITING_URL)
             
-            with open(archive_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
+            if total_size:
+                print(f"Downloading MathWriting dataset over {connections} connections...")
+                self._download_parallel(self.MATHWRITING_URL, archive_path,
+                                        total_size, connections)
+                print(f"Downloaded dataset to: {archive_path}")
+                
+                print("Extracting dataset...")
+                with tarfile.open(archive_path, 'r:gz') as tar:
+                    tar.extractall(path=staging_dir)
+            else:
+                # Download and extract the dataset in one pass, straight from
+                # the HTTP stream, so the archive never has to be written to disk
+                print("Downloading and extracting MathWriting dataset...")
+                with requests.get(self.MATHWRITING_URL, stream=True) as response:
+                    response.raise_for_status()
+                    response.raw.decode_content = True
                     
-            print(f"Downloaded dataset to: {archive_path}")
+                    # 'r|gz' reads the archive sequentially without seeking
+                    with tarfile.open(fileobj=response.raw, mode='r|gz') as tar:
+                        tar.extractall(path=staging_dir)
             
-        except requests.RequestException as e:
-            raise requests.RequestException(f"Failed to download dataset: {e}")
-        
-        # Extract the dataset
-        print("Extracting dataset...")
-        try:
-            with tarfile.open(archive_path, 'r:gz') as tar:
-                tar.extractall(path=self.data_dir)
+            self._move_into_place(staging_dir)
             print(f"Extracted dataset to: {dataset_dir}")
             
+        # Reads from response.raw raise urllib3 errors rather than requests ones
+        except (requests.RequestException, urllib3.exceptions.HTTPError) as e:
+            raise requests.RequestException(f"Failed to download dataset: {e}")
         except tarfile.TarError as e:
             raise tarfile.TarError(f"Failed to extract dataset: {e}")
-        
-        # Clean up archive file
-        if archive_path.exists():
-            os.remove(archive_path)
-            print("Cleaned up archive file")
+        finally:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+            
+            # Clean up archive file
+            if archive_path.exists():
+                os.remove(archive_path)
+                print("Cleaned up archive file")
         
         return str(dataset_dir)
     
+    def _move_into_place(self, staging_dir: Path):
+        """
+        Move fully extracted entries from staging_dir into the data directory.
+        
+        Args:
+            staging_dir: Directory the archive was extracted into
+        """
+        for entry in staging_dir.iterdir():
+            target = self.data_dir / entry.name
+            # Replace what a forced re-download is overwriting
+            if target.is_dir() and not target.is_symlink():
+                shutil.rmtree(target)
+            elif target.exists() or target.is_symlink():
+                target.unlink()
+            os.replace(entry, target)
+    
+    @staticmethod
+    def _get_ranged_size(url: str) -> Optional[int]:
+        """
+        Get the size of a remote file if the server supports range requests.
+        
+        Args:
+            url: File URL
+            
+        Returns:
+            Size in bytes, or None if range requests aren't supported
+        """
+        response = requests.head(url, allow_redirects=True)
+        response.raise_for_status()
+        
+        content_length = response.headers.get('Content-Length')
+        if response.headers.get('Accept-Ranges') != 'bytes' or not content_length:
+            return None
+        
+        return int(content_length)
+    
+    def _download_parallel(self, url: str, path: Path, total_size: int, connections: int):
+        """
+        Download a file as several byte ranges in parallel.
+        
+        Args:
+            url: File URL
+            path: Output file path
+            total_size: Size of the file in bytes
+            connections: Number of ranges to download concurrently
+        """
+        # Preallocate the file so every range can be written at its offset
+        with open(path, 'wb') as f:
+            f.truncate(total_size)
+        
+        segment_size = -(-total_size // connections)  # Ceiling division
+        ranges = [(start, min(start + segment_size, total_size) - 1)
+                  for start in range(0, total_size, segment_size)]
+        
+        with ThreadPoolExecutor(max_workers=connections) as executor:
+            futures = [executor.submit(self._download_range, url, path, start, end)
+                       for start, end in ranges]
+            for future in futures:
+                future.result()  # Re-raise any download error
+    
+    def _download_range(self, url: str, path: Path, start: int, end: int):
+        """
+        Download bytes start..end (inclusive) of a file into the same offset of path.
+        
+        Args:
+            url: File URL
+            path: Preallocated output file path
+            start: First byte of the range
+            end: Last byte of the range
+        """
+        headers = {'Range': f'bytes={start}-{end}'}
+        with requests.get(url, headers=headers, stream=True) as response:
+            response.raise_for_status()
+            if response.status_code != 206:
+                raise requests.RequestException("Server did not honour the range request")
+            
+            with open(path, 'r+b') as f:
+                f.seek(start)
+                for chunk in response.iter_content(chunk_size=self.CHUNK_SIZE):
+                    f.write(chunk)
+    
     def list_dataset_contents(self, dataset_path: Optional[str] = None) -> dict:
         """
         List the contents of a dataset directory.
@@ -103,17 +211,22 @@ class DataDownloader:
             return {"error": f"Dataset path does not exist: {dataset_path}"}
         
         contents = {}
-        for item in dataset_path.iterdir():
-            if item.is_dir():
-                contents[item.name] = {
-                    "type": "directory",
-                    "count": len(list(item.iterdir())) if item.is_dir() else 0
-                }
-            else:
-                contents[item.name] = {
-                    "type": "file",
-                    "size": item.stat().st_size
-                }
+        # DirEntry.is_dir() uses the file type returned by readdir, so
+        # directories don't need an extra stat call
+        with os.scandir(dataset_path) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    with os.scandir(entry.path) as children:
+                        count = sum(1 for _ in children)
+                    contents[entry.name] = {
+                        "type": "directory",
+                        "count": count
+                    }
+                else:
+                    contents[entry.name] = {
+                        "type": "file",
+                        "size": entry.stat().st_size
+                    }
         
         return contents
     
@@ -140,7 +253,8 @@ class DataDownloader:
         if not subdir_path.exists():
             return []
         
-        files = list(subdir_path.glob("*.inkml"))[:limit]
+        # Stop scanning the directory as soon as enough files are found
+        files = islice(subdir_path.glob("*.inkml"), limit)
         return [str(f) for f in files]
     
     def cleanup_data(self):
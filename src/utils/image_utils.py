@@ -6,7 +6,7 @@ expression recognition tasks.
 """
 
 import numpy as np
-from PIL import Image, ImageOps, ImageEnhance
+from PIL import Image, ImageOps, ImageEnhance, ImageFilter
 from typing import Tuple, Union, Optional
 import io
 import base64
@@ -16,7 +16,36 @@ class ImageProcessor:
     """Utility class for image processing operations."""
     
     @staticmethod
-    def preprocess_for_ocr(image: Image.Image,
+    def load_image(filepath: str,
+                   target_size: Optional[Tuple[int, int]] = None) -> Image.Image:
+        """
+        Load an image from file as RGB.
+        
+        Args:
+            filepath: Path to image file
+            target_size: Size the image will be scaled down to, if known. JPEG
+                         files are then decoded directly at a reduced scale
+                         that is still at least this large.
+            
+        Returns:
+            RGB PIL image
+        """
+        image = Image.open(filepath)
+        
+        if target_size is not None:
+            # Only has an effect for formats with scaled decoding (JPEG)
+            image.draft("RGB", tuple(target_size))
+        
+        # Decode now, at the draft scale, so the file is closed right away
+        image.load()
+        
+        if image.mode != "RGB":
+            image = image.convert("RGB")
+        
+        return image
+    
+    @staticmethod
+    def preprocess_for_ocr(image: Union[Image.Image, str],
                           target_size: Tuple[int, int] = (384, 384),
                           background_color: str = "white",
                           maintain_aspect: bool = True) -> Image.Image:
@@ -24,35 +53,44 @@ class ImageProcessor:
         Preprocess image for OCR model input.
         
         Args:
-            image: Input PIL image
+            image: Input PIL image, or path to an image file
             target_size: Target dimensions (width, height)
             background_color: Background color for padding
             maintain_aspect: Whether to maintain aspect ratio
             
         Returns:
-            Preprocessed PIL image
+            Preprocessed PIL image (the input itself if it is already RGB
+            at the target size)
         """
+        if isinstance(image, str):
+            image = ImageProcessor.load_image(image, target_size)
+        
         # Convert to RGB if needed
         if image.mode != "RGB":
             image = image.convert("RGB")
         
-        if maintain_aspect:
-            # Calculate scaling factor
-            scale = min(target_size[0] / image.width, target_size[1] / image.height)
-            new_size = (int(image.width * scale), int(image.height * scale))
-            image = image.resize(new_size, Image.Resampling.LANCZOS)
-        else:
-            image = image.resize(target_size, Image.Resampling.LANCZOS)
+        # Nothing to resize or pad; hand the image back as-is
+        if image.size == tuple(target_size):
+            return image
         
-        # Create new image with background
-        result = Image.new("RGB", target_size, background_color)
+        # Shrink huge inputs by an integer factor with box averaging first, so
+        # the expensive LANCZOS filter runs on at most ~2x the target size.
+        # When fitting, only the limiting dimension needs to stay that large.
+        fit = max if maintain_aspect else min
+        factor = int(fit(image.width / (2 * target_size[0]),
+                         image.height / (2 * target_size[1])))
+        if factor >= 2:
+            image = image.reduce(factor)
         
-        # Center the image
-        x_offset = (target_size[0] - image.width) // 2
-        y_offset = (target_size[1] - image.height) // 2
-        result.paste(image, (x_offset, y_offset))
+        if not maintain_aspect:
+            # Already exactly the target size, no padding needed
+            return image.resize(target_size, Image.Resampling.LANCZOS)
         
-        return result
+        # Scale to fit and center on a background of the target size
+        return ImageOps.pad(image, target_size,
+                            method=Image.Resampling.LANCZOS,
+                            color=background_color,
+                            centering=(0.5, 0.5))
     
     @staticmethod
     def enhance_contrast(image: Image.Image, factor: float = 1.5) -> Image.Image:
@@ -70,73 +108,116 @@ class ImageProcessor:
         return enhancer.enhance(factor)
     
     @staticmethod
-    def binarize_image(image: Image.Image, threshold: int = 128) -> Image.Image:
+    def _as_gray_array(image: Union[Image.Image, np.ndarray]) -> np.ndarray:
+        """
+        Get a grayscale view of an image as a 2-D uint8 array.
+        
+        2-D arrays are taken as grayscale already and are returned as-is, so
+        a gray array can be passed through several operations while only
+        converting the image once. RGB(A) arrays are converted the same way
+        PIL converts RGB images.
+        
+        Args:
+            image: PIL image, 2-D grayscale array, or (H, W, 3|4) uint8 array
+            
+        Returns:
+            2-D grayscale array
+            
+        Raises:
+            ValueError: If an array is neither grayscale nor RGB(A)
+        """
+        if isinstance(image, np.ndarray):
+            if image.ndim == 2:
+                return image
+            if image.ndim == 3 and image.shape[2] in (3, 4):
+                rgb = np.ascontiguousarray(image[..., :3], dtype=np.uint8)
+                return np.asarray(Image.fromarray(rgb, "RGB").convert("L"))
+            raise ValueError(
+                f"Expected a 2-D grayscale or (H, W, 3|4) RGB(A) array, "
+                f"got shape {image.shape}"
+            )
+        if image.mode != "L":
+            image = image.convert("L")
+        return np.asarray(image)
+    
+    @staticmethod
+    def binarize_image(image: Union[Image.Image, np.ndarray],
+                       threshold: int = 128) -> Union[Image.Image, np.ndarray]:
         """
         Convert image to binary (black and white).
         
         Args:
-            image: Input PIL image
+            image: Input PIL image, or grayscale or RGB(A) array
             threshold: Threshold value (0-255)
             
         Returns:
-            Binary PIL image
+            Binary RGB PIL image, or a 2-D array of 0/255 values if an array
+            was given
         """
-        # Convert to grayscale
-        gray = image.convert("L")
+        gray = ImageProcessor._as_gray_array(image)
         
-        # Apply threshold
-        binary = gray.point(lambda x: 255 if x > threshold else 0, mode="1")
+        # Apply threshold in one vectorized pass (0 or 255 per pixel)
+        binary = (gray > threshold).astype(np.uint8) * np.uint8(255)
         
-        return binary.convert("RGB")
+        if isinstance(image, np.ndarray):
+            return binary
+        
+        # Replicate to three channels for an RGB result
+        rgb = np.repeat(binary[..., None], 3, axis=2)
+        
+        return Image.fromarray(rgb, "RGB")
     
     @staticmethod
     def remove_noise(image: Image.Image, kernel_size: int = 3) -> Image.Image:
         """
-        Simple noise removal using median filter approximation.
+        Simple noise removal using a median filter.
         
         Args:
             image: Input PIL image
-            kernel_size: Size of the filter kernel
+            kernel_size: Size of the filter kernel (must be odd)
             
         Returns:
             Filtered PIL image
         """
-        # Convert to numpy array
-        img_array = np.array(image)
-        
-        # Simple median filter approximation
-        from scipy import ndimage
-        filtered = ndimage.median_filter(img_array, size=kernel_size)
-        
-        return Image.fromarray(filtered)
+        # Filters each channel separately with PIL's native median filter
+        return image.filter(ImageFilter.MedianFilter(size=kernel_size))
     
     @staticmethod
-    def crop_to_content(image: Image.Image, margin: int = 10) -> Image.Image:
+    def crop_to_content(image: Union[Image.Image, np.ndarray],
+                        margin: int = 10) -> Union[Image.Image, np.ndarray]:
         """
         Crop image to the bounding box of non-white content.
         
         Args:
-            image: Input PIL image
+            image: Input PIL image, or grayscale or RGB(A) array
             margin: Additional margin around content
             
         Returns:
-            Cropped PIL image
+            Cropped PIL image, or a cropped view of the array
         """
-        # Convert to grayscale for analysis
-        gray = image.convert("L")
+        gray = ImageProcessor._as_gray_array(image)
         
-        # Find bounding box of non-white pixels
-        bbox = ImageOps.invert(gray).getbbox()
+        # Find bounding box of non-white pixels from per-axis reductions
+        mask = gray < 255
+        cols = mask.any(axis=0)
+        rows = mask.any(axis=1)
         
-        if bbox is None:
+        if not cols.any():
             return image  # No content found
         
+        left = int(cols.argmax())
+        right = len(cols) - int(cols[::-1].argmax())
+        top = int(rows.argmax())
+        bottom = len(rows) - int(rows[::-1].argmax())
+        
         # Add margin
-        left, top, right, bottom = bbox
         left = max(0, left - margin)
         top = max(0, top - margin)
-        right = min(image.width, right + margin)
-        bottom = min(image.height, bottom + margin)
+        right = min(gray.shape[1], right + margin)
+        bottom = min(gray.shape[0], bottom + margin)
+        
+        if isinstance(image, np.ndarray):
+            return image[top:bottom, left:right]
         
         return image.crop((left, top, right, bottom))
     
@@ -173,8 +254,11 @@ class ImageProcessor:
         """
         buffer = io.BytesIO()
         image.save(buffer, format=format)
-        encoded_string = base64.b64encode(buffer.getvalue()).decode()
-        return f"data:image/{format.lower()};base64,{encoded_string}"
+        
+        # Encode straight from the buffer's memory instead of a getvalue()
+        # copy; joining and decoding still copy the encoded data once each
+        header = b"data:image/" + format.lower().encode("ascii") + b";base64,"
+        return b"".join((header, base64.b64encode(buffer.getbuffer()))).decode("ascii")
     
     @staticmethod
     def resize_with_padding(image: Image.Image, 
@@ -191,6 +275,9 @@ class ImageProcessor:
         Returns:
             Resized and padded PIL image
         """
+        if image.size == tuple(target_size):
+            return image if image.mode == "RGB" else image.convert("RGB")
+        
         # Calculate scaling factor to fit within target size
         scale = min(target_size[0] / image.width, target_size[1] / image.height)
         new_size = (int(image.width * scale), int(image.height * scale))
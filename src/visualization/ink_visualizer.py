@@ -5,29 +5,141 @@ This module provides functionality to visualize InkML data and mathematical
 expressions in various formats.
 """
 
-import matplotlib.pyplot as plt
 import matplotlib.patches as mpl_patches
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import LineCollection, PatchCollection
+from matplotlib.figure import Figure
+from matplotlib import colormaps
+from concurrent.futures import ProcessPoolExecutor
 from typing import Tuple, Optional, Union, List
+import functools
+import os
 import numpy as np
-from ..data.ink_processor import Ink
+from ..data.ink_processor import Ink, InkProcessor
+
+
+@functools.lru_cache(maxsize=32)
+def _tab10_colors(n: int) -> np.ndarray:
+    """Read-only (n, 4) RGBA array cycling through the 10 tab10 colors."""
+    colors = colormaps['tab10'](np.arange(n) % 10)
+    colors.flags.writeable = False
+    return colors
+
+
+def _render_and_save(task):
+    """Worker for InkVisualizer.save_many: draw one ink and save it."""
+    ink, filename, dpi, display_kwargs = task
+    fig = InkVisualizer.display_ink(ink, **display_kwargs)
+    InkVisualizer.save_visualization(fig, filename, dpi=dpi, close=True)
 
 
 class InkVisualizer:
     """
     Visualizer class for ink data and mathematical expressions.
+    
+    Figures are created directly with an Agg canvas rather than through
+    pyplot, so they are not registered globally and are freed once no longer
+    referenced. pyplot.show() does not know about them: in Jupyter, enable
+    figure output once with %matplotlib inline and return the figure as the
+    value of a cell (or pass it to IPython's display()); in scripts, save it
+    with save_visualization.
     """
     
     def __init__(self):
         """Initialize the visualizer."""
         pass
     
+    @staticmethod
+    def _new_figure(figsize: Tuple[float, float],
+                    layout: Optional[str] = None) -> Figure:
+        """
+        Create a figure attached to an Agg canvas, bypassing pyplot.
+        
+        Args:
+            figsize: Figure size (width, height)
+            layout: Layout engine ('constrained', 'tight' or None)
+            
+        Returns:
+            matplotlib Figure object
+        """
+        fig = Figure(figsize=figsize, layout=layout)
+        FigureCanvasAgg(fig)
+        return fig
+    
+    @staticmethod
+    def _stroke_segments(ink: Ink,
+                         max_points_per_stroke: Optional[int] = None) -> List[np.ndarray]:
+        """
+        Get the strokes of an ink as (number of points, 2) x/y arrays.
+        
+        Args:
+            ink: Ink object
+            max_points_per_stroke: Longer strokes are subsampled to this many
+                                   evenly spaced points, keeping both ends
+                                   (None to keep every point)
+            
+        Returns:
+            List of stroke segments, as taken by LineCollection
+        """
+        # (n, 2) views of the x/y rows, no copies
+        segments = [stroke[:2].T for stroke in ink.strokes]
+        
+        if max_points_per_stroke is not None:
+            # Dense digitizer strokes carry far more points than the figure
+            # has pixels along them
+            segments = [
+                segment[np.linspace(0, len(segment) - 1, max_points_per_stroke).astype(np.intp)]
+                if len(segment) > max_points_per_stroke else segment
+                for segment in segments
+            ]
+        
+        return segments
+    
+    @staticmethod
+    def _stroke_collection(ink: Ink,
+                           linewidth: float,
+                           color: Optional[str] = None,
+                           max_points_per_stroke: Optional[int] = None,
+                           rasterized: bool = False) -> LineCollection:
+        """
+        Build one LineCollection holding every stroke of an ink.
+        
+        Args:
+            ink: Ink object to draw
+            linewidth: Line width for strokes
+            color: Color for all strokes (None to cycle through the default
+                   color cycle, one color per stroke)
+            max_points_per_stroke: Longer strokes are subsampled to this many
+                                   evenly spaced points, keeping both ends
+                                   (None to draw every point)
+            rasterized: Whether vector output (PDF, SVG) embeds the strokes
+                        as one raster image instead of a path per stroke
+            
+        Returns:
+            LineCollection with one segment per stroke
+        """
+        segments = InkVisualizer._stroke_segments(ink, max_points_per_stroke)
+        
+        return LineCollection(segments, linewidths=linewidth,
+                              colors=InkVisualizer._stroke_colors(len(segments), color),
+                              rasterized=rasterized)
+    
+    @staticmethod
+    def _stroke_colors(n: int, color: Optional[str] = None) -> Union[str, List[str]]:
+        """Colors for n strokes: the given color, or the default color cycle."""
+        if color is None:
+            return [f'C{i}' for i in range(n)]
+        return color
+    
     @staticmethod
     def display_ink(ink: Ink, 
                    figsize: Tuple[int, int] = (15, 10),
                    linewidth: int = 2,
                    color: Optional[str] = None,
                    title: Optional[str] = None,
-                   show_annotations: bool = True) -> plt.Figure:
+                   show_annotations: bool = True,
+                   max_points_per_stroke: Optional[int] = 2000,
+                   rasterize_strokes: bool = True) -> Figure:
         """
         Simple display for a single ink.
         
@@ -38,53 +150,123 @@ class InkVisualizer:
             color: Color for strokes (None for default)
             title: Custom title (None for auto-generated)
             show_annotations: Whether to show annotation information
+            max_points_per_stroke: Subsample longer strokes to this many
+                                   points (None to draw every point)
+            rasterize_strokes: Whether vector output (PDF, SVG) embeds the
+                               strokes as a raster image at the save dpi,
+                               keeping axes and text as vectors
             
         Returns:
             matplotlib Figure object
         """
-        fig = plt.figure(figsize=figsize)
+        fig = InkVisualizer._new_figure(figsize)
         
         if not ink.strokes:
-            plt.text(0.5, 0.5, 'No strokes to display', 
-                    horizontalalignment='center', verticalalignment='center',
-                    transform=plt.gca().transAxes, fontsize=16)
+            # Placeholder text goes on the figure itself; no Axes needed
+            fig.text(0.5, 0.5, 'No strokes to display', 
+                     horizontalalignment='center', verticalalignment='center',
+                     fontsize=16)
             if title:
-                plt.title(title)
+                fig.suptitle(title)
             return fig
         
-        # Plot each stroke
-        for stroke in ink.strokes:
-            plt.plot(stroke[0], stroke[1], linewidth=linewidth, color=color)
-        
         # Generate title from annotations or use custom title
         if title is None and show_annotations:
-            title_parts = []
-            if 'sampleId' in ink.annotations:
-                title_parts.append(ink.annotations['sampleId'])
-            if 'splitTagOriginal' in ink.annotations:
-                title_parts.append(ink.annotations['splitTagOriginal'])
-            if 'normalizedLabel' in ink.annotations:
-                title_parts.append(ink.annotations['normalizedLabel'])
-            elif 'label' in ink.annotations:
-                title_parts.append(ink.annotations['label'])
+            title = InkVisualizer._annotation_title(ink)
+        
+        InkVisualizer._draw_ink(fig.add_subplot(), ink, linewidth, color, title,
+                                max_points_per_stroke, rasterize_strokes)
+        
+        return fig
+    
+    @staticmethod
+    def _annotation_title(ink: Ink) -> str:
+        """
+        Build a display title from an ink's annotations.
+        
+        Args:
+            ink: Ink object
             
-            title = " -- ".join(title_parts) if title_parts else "Ink Visualization"
+        Returns:
+            Title string
+        """
+        title_parts = []
+        if 'sampleId' in ink.annotations:
+            title_parts.append(ink.annotations['sampleId'])
+        if 'splitTagOriginal' in ink.annotations:
+            title_parts.append(ink.annotations['splitTagOriginal'])
+        if 'normalizedLabel' in ink.annotations:
+            title_parts.append(ink.annotations['normalizedLabel'])
+        elif 'label' in ink.annotations:
+            title_parts.append(ink.annotations['label'])
+        
+        return " -- ".join(title_parts) if title_parts else "Ink Visualization"
+    
+    @staticmethod
+    def _draw_ink(ax, ink: Ink,
+                  linewidth: float,
+                  color: Optional[str] = None,
+                  title: Optional[str] = None,
+                  max_points_per_stroke: Optional[int] = None,
+                  rasterize_strokes: bool = False):
+        """
+        Draw an ink onto an Axes in the layout used by display_ink.
+        
+        Args:
+            ax: matplotlib Axes to draw on
+            ink: Ink object to draw
+            linewidth: Line width for strokes
+            color: Color for strokes (None for default)
+            title: Axes title (None for no title)
+            max_points_per_stroke: Subsample longer strokes to this many
+                                   points (None to draw every point)
+            rasterize_strokes: Whether to rasterize strokes in vector output
+        """
+        # Plot all strokes as a single artist
+        ax.add_collection(InkVisualizer._stroke_collection(ink, linewidth, color,
+                                                           max_points_per_stroke,
+                                                           rasterize_strokes))
+        ax.autoscale_view(scaley=False)
         
         if title:
-            plt.title(title)
+            ax.set_title(title)
+        
+        InkVisualizer._set_inverted_ylim(ax, ink)  # Standard ink coordinate system
+        ax.set_aspect('equal', adjustable='datalim')  # Equal aspect ratio
+        ax.set_xlabel('X')
+        ax.set_ylabel('Y')
+    
+    @staticmethod
+    def _set_inverted_ylim(ax, ink: Ink):
+        """
+        Set an inverted y range covering the ink, with the Axes' usual margin.
         
-        plt.gca().invert_yaxis()  # Invert y-axis for standard ink coordinate system
-        plt.gca().axis('equal')   # Equal aspect ratio
-        plt.xlabel('X')
-        plt.ylabel('Y')
+        The limits come straight from the ink's points, instead of
+        autoscaling y and then flipping it with invert_yaxis().
         
-        return fig
+        Args:
+            ax: matplotlib Axes showing the ink
+            ink: Ink object drawn on the Axes
+        """
+        bbox = InkProcessor.get_bounding_box(ink)
+        if bbox is None:
+            ax.set_ylim(1, 0, auto=None)
+            return
+        
+        min_y, max_y = bbox[1], bbox[3]
+        margin = ax.margins()[1] * (max_y - min_y) or 1.0
+        # auto=None keeps y autoscaling on, so the equal aspect can still
+        # adjust these limits instead of logging that it ignores them
+        ax.set_ylim(max_y + margin, min_y - margin, auto=None)
     
     @staticmethod
     def display_multiple_inks(inks: List[Ink], 
                              cols: int = 3,
                              figsize: Tuple[int, int] = (15, 10),
-                             linewidth: int = 2) -> plt.Figure:
+                             linewidth: int = 2,
+                             max_points_per_stroke: Optional[int] = 2000,
+                             rasterize_strokes: bool = True,
+                             show_titles: bool = True) -> Figure:
         """
         Display multiple inks in a grid layout.
         
@@ -93,48 +275,53 @@ class InkVisualizer:
             cols: Number of columns in the grid
             figsize: Figure size (width, height)
             linewidth: Line width for strokes
+            max_points_per_stroke: Subsample longer strokes to this many
+                                   points (None to draw every point)
+            rasterize_strokes: Whether vector output (PDF, SVG) embeds the
+                               strokes as a raster image at the save dpi,
+                               keeping axes and text as vectors
+            show_titles: Whether to title each subplot with the ink's label.
+                         Titles take part in layout, so large grids render
+                         faster without them.
             
         Returns:
             matplotlib Figure object
         """
+        fig = InkVisualizer._new_figure(figsize, layout='constrained')
+        
         if not inks:
-            fig = plt.figure(figsize=figsize)
-            plt.text(0.5, 0.5, 'No inks to display', 
-                    horizontalalignment='center', verticalalignment='center',
-                    transform=plt.gca().transAxes, fontsize=16)
+            fig.text(0.5, 0.5, 'No inks to display', 
+                     horizontalalignment='center', verticalalignment='center',
+                     fontsize=16)
             return fig
         
         rows = (len(inks) + cols - 1) // cols
-        fig, axes = plt.subplots(rows, cols, figsize=figsize)
-        
-        # Handle single row case
-        if rows == 1:
-            axes = [axes] if cols == 1 else axes
-        else:
-            axes = axes.flatten()
+        axes = fig.subplots(rows, cols, squeeze=False).ravel()
         
         for i, ink in enumerate(inks):
-            ax = axes[i] if len(inks) > 1 else plt.gca()
+            ax = axes[i]
             
             # Plot strokes
-            for stroke in ink.strokes:
-                ax.plot(stroke[0], stroke[1], linewidth=linewidth)
+            ax.add_collection(InkVisualizer._stroke_collection(
+                ink, linewidth, max_points_per_stroke=max_points_per_stroke,
+                rasterized=rasterize_strokes))
+            ax.autoscale_view(scaley=False)
             
             # Set title from annotations
-            title = ink.annotations.get('label', f'Ink {i+1}')
-            ax.set_title(title, fontsize=10)
-            ax.invert_yaxis()
-            ax.axis('equal')
+            if show_titles:
+                title = ink.annotations.get('label', f'Ink {i+1}')
+                ax.set_title(title, fontsize=10)
+            InkVisualizer._set_inverted_ylim(ax, ink)
+            ax.set_aspect('equal', adjustable='datalim')
         
         # Hide empty subplots
         for i in range(len(inks), len(axes)):
             axes[i].set_visible(False)
         
-        plt.tight_layout()
         return fig
     
     @staticmethod
-    def plot_stroke_statistics(inks: List[Ink]) -> plt.Figure:
+    def plot_stroke_statistics(inks: List[Ink]) -> Figure:
         """
         Plot statistics about stroke data.
         
@@ -145,88 +332,111 @@ class InkVisualizer:
             matplotlib Figure object
         """
         if not inks:
-            fig = plt.figure(figsize=(10, 6))
-            plt.text(0.5, 0.5, 'No data to analyze', 
-                    horizontalalignment='center', verticalalignment='center',
-                    transform=plt.gca().transAxes, fontsize=16)
+            fig = InkVisualizer._new_figure((10, 6))
+            fig.text(0.5, 0.5, 'No data to analyze', 
+                     horizontalalignment='center', verticalalignment='center',
+                     fontsize=16)
             return fig
         
-        stroke_counts = [len(ink.strokes) for ink in inks]
-        point_counts = [sum(stroke.shape[1] for stroke in ink.strokes) for ink in inks]
+        # Counts come straight from the stroke offsets and point arrays,
+        # without building per-stroke views
+        stroke_counts = np.fromiter((InkProcessor.stroke_count(ink) for ink in inks),
+                                    dtype=np.int64, count=len(inks))
+        point_counts = np.fromiter((InkProcessor.point_count(ink) for ink in inks),
+                                   dtype=np.int64, count=len(inks))
         
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(12, 5))
+        fig = InkVisualizer._new_figure((12, 5), layout='constrained')
+        ax1, ax2 = fig.subplots(1, 2)
+        
+        # Bin with NumPy and draw each histogram as a single stairs artist
+        # rather than one Rectangle per bin
         
         # Stroke count histogram
-        ax1.hist(stroke_counts, bins=20, alpha=0.7, edgecolor='black')
+        counts, edges = np.histogram(stroke_counts, bins=20)
+        ax1.stairs(counts, edges, fill=True, alpha=0.7, edgecolor='black')
         ax1.set_xlabel('Number of Strokes')
         ax1.set_ylabel('Frequency')
         ax1.set_title('Distribution of Stroke Counts')
         ax1.grid(True, alpha=0.3)
         
         # Point count histogram
-        ax2.hist(point_counts, bins=20, alpha=0.7, edgecolor='black')
+        counts, edges = np.histogram(point_counts, bins=20)
+        ax2.stairs(counts, edges, fill=True, alpha=0.7, edgecolor='black')
         ax2.set_xlabel('Number of Points')
         ax2.set_ylabel('Frequency')
         ax2.set_title('Distribution of Point Counts')
         ax2.grid(True, alpha=0.3)
         
-        plt.tight_layout()
         return fig
     
     @staticmethod
     def plot_bounding_boxes(inks: List[Ink], 
-                           figsize: Tuple[int, int] = (10, 8)) -> plt.Figure:
+                           figsize: Tuple[int, int] = (10, 8),
+                           show_labels: bool = True) -> Figure:
         """
         Visualize bounding boxes of multiple inks.
         
         Args:
             inks: List of Ink objects
             figsize: Figure size (width, height)
+            show_labels: Whether to label each box and add a legend. Each
+                         label is a separate text artist, so turning this
+                         off is much faster for many inks.
             
         Returns:
             matplotlib Figure object
         """
-        from ..data.ink_processor import InkProcessor
+        fig = InkVisualizer._new_figure(figsize)
+        ax = fig.add_subplot()
         
-        fig = plt.figure(figsize=figsize)
+        colors = _tab10_colors(len(inks))
         
-        colors = plt.cm.tab10(np.linspace(0, 1, len(inks)))
+        # Boxes of all inks at once; inks without points have NaN rows
+        boxes = InkProcessor.get_bounding_boxes(inks)
+        indices = np.flatnonzero(~np.isnan(boxes[:, 0]))
+        xy = boxes[indices, :2]
+        sizes = boxes[indices, 2:] - xy
+        centers = xy + sizes / 2
+        edge_colors = colors[indices]
         
-        for i, ink in enumerate(inks):
-            bbox = InkProcessor.get_bounding_box(ink)
-            if bbox is None:
-                continue
-                
-            min_x, min_y, max_x, max_y = bbox
-            width = max_x - min_x
-            height = max_y - min_y
-            
-            # Create rectangle
-            rect = mpl_patches.Rectangle((min_x, min_y), width, height,
-                                       linewidth=2, edgecolor=colors[i],
-                                       facecolor='none', alpha=0.7,
-                                       label=f'Ink {i+1}')
-            plt.gca().add_patch(rect)
-            
-            # Add label
-            plt.text(min_x + width/2, min_y + height/2, f'Ink {i+1}',
-                    ha='center', va='center', fontsize=8,
-                    bbox=dict(boxstyle="round,pad=0.1", facecolor='white', alpha=0.8))
-        
-        plt.xlabel('X')
-        plt.ylabel('Y')
-        plt.title('Bounding Boxes of Ink Objects')
-        plt.legend()
-        plt.grid(True, alpha=0.3)
-        plt.axis('equal')
+        rects = [mpl_patches.Rectangle((x, y), width, height)
+                 for (x, y), (width, height) in zip(xy.tolist(), sizes.tolist())]
+        
+        legend_handles = []
+        if show_labels:
+            for i, (center_x, center_y), edge_color in zip(indices.tolist(), centers.tolist(),
+                                                           edge_colors):
+                # Add label
+                ax.text(center_x, center_y, f'Ink {i+1}',
+                        ha='center', va='center', fontsize=8,
+                        bbox=dict(boxstyle="round,pad=0.1", facecolor='white', alpha=0.8))
+                legend_handles.append(mpl_patches.Patch(
+                    edgecolor=edge_color, facecolor='none', alpha=0.7,
+                    linewidth=2, label=f'Ink {i+1}'))
+        
+        # All rectangles are drawn by one artist
+        ax.add_collection(PatchCollection(rects, edgecolors=edge_colors,
+                                          facecolors='none', linewidths=2,
+                                          alpha=0.7))
+        ax.autoscale_view()
+        
+        ax.set_xlabel('X')
+        ax.set_ylabel('Y')
+        ax.set_title('Bounding Boxes of Ink Objects')
+        if legend_handles:
+            ax.legend(handles=legend_handles)
+        ax.grid(True, alpha=0.3)
+        ax.set_aspect('equal', adjustable='datalim')
         
         return fig
     
     @staticmethod
-    def save_visualization(fig: plt.Figure, 
-                          filename: str, 
+    def save_visualization(fig: Figure, 
+                          filename: Union[str, os.PathLike], 
                           dpi: int = 300,
-                          bbox_inches: str = 'tight'):
+                          bbox_inches: Optional[str] = None,
+                          close: bool = False,
+                          tight: bool = False):
         """
         Save a visualization to file.
         
@@ -234,7 +444,271 @@ class InkVisualizer:
             fig: matplotlib Figure object
             filename: Output filename
             dpi: Resolution for raster formats
-            bbox_inches: Bounding box mode for saving
+            bbox_inches: Bounding box mode for saving (None for the whole
+                         figure)
+            close: Whether to clear the figure after saving, releasing its
+                   artists right away. Turn this on when saving many figures
+                   in a loop and the figures are not needed afterwards.
+            tight: Whether to crop to the drawn content, same as
+                   bbox_inches='tight'. This renders the figure twice, once
+                   to measure it and once to save it.
         """
+        if tight:
+            bbox_inches = 'tight'
+        
         fig.savefig(filename, dpi=dpi, bbox_inches=bbox_inches)
-        print(f"Visualization saved to: {filename}")
\ No newline at end of file
+        print(f"Visualization saved to: {filename}")
+        
+        if close:
+            fig.clear()
+    
+    @staticmethod
+    def save_many(inks: List[Ink],
+                  filenames: List[str],
+                  dpi: int = 300,
+                  workers: Optional[int] = None,
+                  **display_kwargs):
+        """
+        Render and save many inks in parallel worker processes.
+        
+        Each ink is drawn with display_ink and written with
+        save_visualization. Rendering only uses the Agg canvas, so the
+        workers never need a GUI backend.
+        
+        Args:
+            inks: List of Ink objects to render
+            filenames: Output filename for each ink
+            dpi: Resolution for raster formats
+            workers: Number of worker processes (None for one per CPU)
+            **display_kwargs: Extra keyword arguments for display_ink
+            
+        Raises:
+            ValueError: If inks and filenames differ in length
+        """
+        if len(inks) != len(filenames):
+            raise ValueError("inks and filenames must have the same length")
+        
+        tasks = [(ink, filename, dpi, display_kwargs)
+                 for ink, filename in zip(inks, filenames)]
+        
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            # Consume the results so that any exception is raised here
+            list(executor.map(_render_and_save, tasks, chunksize=8))
+
+
+class ReusableInkRenderer:
+    """
+    Renders many inks to image files, reusing the same figures.
+    
+    Creating a figure and its Axes dominates the cost of rendering a small
+    ink, so this renderer builds them once and only clears and redraws the
+    Axes for each ink. Grid figures are kept per (rows, cols) shape.
+    """
+    
+    def __init__(self,
+                 figsize: Tuple[int, int] = (15, 10),
+                 linewidth: int = 2,
+                 color: Optional[str] = None,
+                 dpi: int = 100,
+                 max_points_per_stroke: Optional[int] = 2000):
+        """
+        Initialize the renderer.
+        
+        Args:
+            figsize: Figure size (width, height)
+            linewidth: Line width for strokes
+            color: Color for strokes (None for default)
+            dpi: Resolution of the written PNG files
+            max_points_per_stroke: Subsample longer strokes to this many
+                                   points (None to draw every point)
+        """
+        self.figsize = figsize
+        self.linewidth = linewidth
+        self.color = color
+        self.dpi = dpi
+        self.max_points_per_stroke = max_points_per_stroke
+        
+        self.fig = self._new_figure(layout='constrained')
+        self.ax = self.fig.add_subplot()
+        self._grids = {}
+    
+    def _new_figure(self, layout: Optional[str] = None) -> Figure:
+        """Create a figure at the renderer's size and resolution."""
+        fig = InkVisualizer._new_figure(self.figsize, layout=layout)
+        fig.set_dpi(self.dpi)
+        return fig
+    
+    def render_to(self, ink: Ink, path: str, title: Optional[str] = None):
+        """
+        Render a single ink to a PNG file.
+        
+        Args:
+            ink: Ink object to render
+            path: Output PNG path
+            title: Custom title (None for auto-generated)
+        """
+        if title is None:
+            title = InkVisualizer._annotation_title(ink)
+        
+        self.ax.clear()
+        InkVisualizer._draw_ink(self.ax, ink, self.linewidth, self.color, title,
+                                self.max_points_per_stroke)
+        self.fig.canvas.print_png(path)
+    
+    def render_grid_to(self, inks: List[Ink], path: str, cols: int = 3,
+                       show_titles: bool = True):
+        """
+        Render inks in a grid layout to a PNG file.
+        
+        Args:
+            inks: List of Ink objects to render
+            path: Output PNG path
+            cols: Number of columns in the grid
+            show_titles: Whether to title each subplot with the ink's label
+        """
+        rows = max(1, (len(inks) + cols - 1) // cols)
+        
+        if (rows, cols) not in self._grids:
+            fig = self._new_figure(layout='constrained')
+            self._grids[rows, cols] = (fig, fig.subplots(rows, cols, squeeze=False).ravel())
+        fig, axes = self._grids[rows, cols]
+        
+        for i, ax in enumerate(axes):
+            ax.clear()
+            ax.set_visible(i < len(inks))
+            if i >= len(inks):
+                continue
+            
+            ink = inks[i]
+            ax.add_collection(InkVisualizer._stroke_collection(
+                ink, self.linewidth, self.color, self.max_points_per_stroke))
+            ax.autoscale_view(scaley=False)
+            if show_titles:
+                ax.set_title(ink.annotations.get('label', f'Ink {i+1}'), fontsize=10)
+            InkVisualizer._set_inverted_ylim(ax, ink)
+            ax.set_aspect('equal', adjustable='datalim')
+        
+        fig.canvas.print_png(path)
+
+
+class InteractiveInkViewer:
+    """
+    Steps through inks in an interactive figure, redrawing only the strokes.
+    
+    The figure is drawn in full once and the Axes background (frame, ticks,
+    grid) is cached. Switching inks then restores that background and
+    blits just the stroke collection and label, instead of redrawing the
+    whole figure. Use the right/left arrow keys (or n/p) to move between
+    inks. Requires an interactive matplotlib backend, e.g. ipympl
+    (%matplotlib widget) in Jupyter.
+    """
+    
+    def __init__(self, inks: List[Ink],
+                 figsize: Tuple[int, int] = (10, 6),
+                 linewidth: int = 2,
+                 max_points_per_stroke: Optional[int] = 2000):
+        """
+        Initialize the viewer and show the first ink.
+        
+        Args:
+            inks: List of Ink objects to step through
+            figsize: Figure size (width, height)
+            linewidth: Line width for strokes
+            max_points_per_stroke: Subsample longer strokes to this many
+                                   points (None to draw every point)
+            
+        Raises:
+            ValueError: If inks is empty
+        """
+        if not inks:
+            raise ValueError("InteractiveInkViewer needs at least one ink")
+        
+        # pyplot is only needed here, to get a canvas from the GUI backend
+        import matplotlib.pyplot as plt
+        
+        self.inks = inks
+        self.max_points_per_stroke = max_points_per_stroke
+        self.index = 0
+        
+        self.fig, self.ax = plt.subplots(figsize=figsize)
+        self.canvas = self.fig.canvas
+        
+        # Fix the view to cover every ink, so the cached background stays
+        # valid for all of them
+        boxes = InkProcessor.get_bounding_boxes(inks)
+        if not np.isnan(boxes).all():
+            min_x, min_y = np.nanmin(boxes[:, :2], axis=0)
+            max_x, max_y = np.nanmax(boxes[:, 2:], axis=0)
+            self.ax.set_xlim(min_x, max_x)
+            self.ax.set_ylim(max_y, min_y)  # Inverted y-axis for ink coordinates
+        # The limits are fixed, so the Axes box takes up the aspect ratio
+        self.ax.set_aspect('equal', adjustable='box')
+        self.ax.set_xlabel('X')
+        self.ax.set_ylabel('Y')
+        
+        # Animated artists are skipped by full draws and only blitted
+        self._collection = LineCollection([], linewidths=linewidth, animated=True)
+        self.ax.add_collection(self._collection, autolim=False)
+        self._label = self.ax.text(0.01, 0.99, '', transform=self.ax.transAxes,
+                                   ha='left', va='top', animated=True)
+        
+        self._background = None
+        self.canvas.mpl_connect('draw_event', self._on_draw)
+        self.canvas.mpl_connect('key_press_event', self._on_key)
+        
+        self.show(0)
+    
+    def show(self, index: int):
+        """
+        Show the ink at the given index (wrapping around at either end).
+        
+        Args:
+            index: Index into the viewer's inks
+        """
+        self.index = index % len(self.inks)
+        ink = self.inks[self.index]
+        
+        segments = InkVisualizer._stroke_segments(ink, self.max_points_per_stroke)
+        self._collection.set_segments(segments)
+        self._collection.set_color(InkVisualizer._stroke_colors(len(segments)))
+        
+        label = ink.annotations.get('label', f'Ink {self.index + 1}')
+        self._label.set_text(f'{label} ({self.index + 1}/{len(self.inks)})')
+        
+        self._blit()
+    
+    def next(self):
+        """Show the next ink."""
+        self.show(self.index + 1)
+    
+    def previous(self):
+        """Show the previous ink."""
+        self.show(self.index - 1)
+    
+    def _on_draw(self, event):
+        """Re-cache the background after every full draw (e.g. on resize)."""
+        self._background = self.canvas.copy_from_bbox(self.ax.bbox)
+        self._draw_animated()
+    
+    def _on_key(self, event):
+        """Step through inks with the arrow keys."""
+        if event.key in ('right', 'n'):
+            self.next()
+        elif event.key in ('left', 'p'):
+            self.previous()
+    
+    def _draw_animated(self):
+        """Draw the animated artists on top of the current canvas."""
+        self.ax.draw_artist(self._collection)
+        self.ax.draw_artist(self._label)
+    
+    def _blit(self):
+        """Update the strokes on screen without a full redraw."""
+        if self._background is None:
+            # Nothing drawn yet; the first draw event will blit
+            self.canvas.draw_idle()
+            return
+        
+        self.canvas.restore_region(self._background)
+        self._draw_animated()
+        self.canvas.blit(self.ax.bbox)
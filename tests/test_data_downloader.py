@@ -0,0 +1,88 @@
+"""
+Tests for dataset downloading in La-Math-ex.
+"""
+
+import os
+import sys
+import tarfile
+
+import pytest
+
+# Add the package sources to path for local development
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils import data_downloader
+from utils.data_downloader import DataDownloader
+
+
+class FakeRaw:
+    """Stand-in for the urllib3 stream behind a response."""
+    
+    decode_content = False
+
+
+class FakeResponse:
+    """Stand-in for a streamed requests response."""
+    
+    def __init__(self):
+        self.raw = FakeRaw()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        return False
+    
+    def raise_for_status(self):
+        pass
+
+
+class FakeTar:
+    """Tar archive that writes part of the dataset, then optionally fails."""
+    
+    def __init__(self, fail):
+        self.fail = fail
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        return False
+    
+    def extractall(self, path):
+        dataset = os.path.join(path, "mathwriting-2024", "train")
+        os.makedirs(dataset)
+        with open(os.path.join(dataset, "sample.inkml"), "w") as f:
+            f.write("<ink/>")
+        if self.fail:
+            raise tarfile.ReadError("unexpected end of data")
+
+
+def use_fake_archive(monkeypatch, fail):
+    monkeypatch.setattr(data_downloader.requests, "get",
+                        lambda url, stream: FakeResponse())
+    monkeypatch.setattr(data_downloader.tarfile, "open",
+                        lambda *args, **kwargs: FakeTar(fail))
+
+
+def test_interrupted_extract_leaves_no_dataset(tmp_path, monkeypatch):
+    use_fake_archive(monkeypatch, fail=True)
+    downloader = DataDownloader(str(tmp_path))
+    
+    with pytest.raises(tarfile.TarError):
+        downloader.download_mathwriting_dataset()
+    
+    assert not (tmp_path / "mathwriting-2024").exists()
+    # The staging directory is cleaned up too
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_completed_extract_is_moved_into_place(tmp_path, monkeypatch):
+    use_fake_archive(monkeypatch, fail=False)
+    downloader = DataDownloader(str(tmp_path))
+    
+    dataset_dir = downloader.download_mathwriting_dataset()
+    
+    assert dataset_dir == str(tmp_path / "mathwriting-2024")
+    assert (tmp_path / "mathwriting-2024" / "train" / "sample.inkml").exists()
+    assert [p.name for p in tmp_path.iterdir()] == ["mathwriting-2024"]
@@ -0,0 +1,56 @@
+"""
+Tests for the CROHME extraction script in La-Math-ex.
+"""
+
+import os
+import shutil
+import sys
+
+# Add the scripts directory to path for local development
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from extract_crohme import link_or_copy
+
+
+def test_link_or_copy_over_existing_link_keeps_other_source(tmp_path):
+    first = tmp_path / "first.png"
+    second = tmp_path / "second.png"
+    dst = tmp_path / "out.png"
+    first.write_bytes(b"first")
+    second.write_bytes(b"second")
+    
+    link_or_copy(str(first), str(dst))
+    link_or_copy(str(second), str(dst))
+    
+    assert first.read_bytes() == b"first"
+    assert dst.read_bytes() == b"second"
+
+
+def test_link_or_copy_falls_back_to_copy(tmp_path, monkeypatch):
+    first = tmp_path / "first.png"
+    second = tmp_path / "second.png"
+    dst = tmp_path / "out.png"
+    first.write_bytes(b"first")
+    second.write_bytes(b"second")
+    shutil.copyfile(first, dst)
+    
+    def no_links(src, dst):
+        raise OSError("hard links not supported")
+    
+    monkeypatch.setattr(os, "link", no_links)
+    link_or_copy(str(second), str(dst))
+    
+    assert first.read_bytes() == b"first"
+    assert dst.read_bytes() == b"second"
+
+
+def test_link_or_copy_same_file_is_left_alone(tmp_path):
+    src = tmp_path / "src.png"
+    dst = tmp_path / "out.png"
+    src.write_bytes(b"image")
+    
+    link_or_copy(str(src), str(dst))
+    link_or_copy(str(src), str(dst))
+    
+    assert os.path.samefile(src, dst)
+    assert dst.read_bytes() == b"image"
@@ -0,0 +1,63 @@
+"""
+Tests for image processing utilities in La-Math-ex.
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+from PIL import Image
+
+# Add the package sources to path for local development
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils.image_utils import ImageProcessor
+
+
+def make_rgb_array():
+    """White 20x30 RGB canvas with a dark mark at rows 5-9, cols 10-14."""
+    rgb = np.full((20, 30, 3), 255, dtype=np.uint8)
+    rgb[5:10, 10:15] = (10, 40, 200)
+    return rgb
+
+
+def test_binarize_matches_for_pil_and_rgb_array():
+    rgb = make_rgb_array()
+
+    from_pil = np.asarray(ImageProcessor.binarize_image(Image.fromarray(rgb)))
+    from_array = ImageProcessor.binarize_image(rgb)
+
+    assert from_array.shape == (20, 30)
+    assert np.array_equal(from_pil[..., 0], from_array)
+
+
+def test_binarize_gray_array():
+    gray = np.asarray(Image.fromarray(make_rgb_array()).convert("L"))
+
+    binary = ImageProcessor.binarize_image(gray)
+
+    assert binary.shape == gray.shape
+    assert set(np.unique(binary)) == {0, 255}
+    assert (binary[5:10, 10:15] == 0).all()
+
+
+def test_crop_matches_for_pil_gray_and_rgb_array():
+    rgb = make_rgb_array()
+    gray = np.asarray(Image.fromarray(rgb).convert("L"))
+
+    from_pil = ImageProcessor.crop_to_content(Image.fromarray(rgb), margin=2)
+    from_gray = ImageProcessor.crop_to_content(gray, margin=2)
+    from_rgb = ImageProcessor.crop_to_content(rgb, margin=2)
+
+    assert from_pil.size == (9, 9)
+    assert from_gray.shape == (9, 9)
+    assert from_rgb.shape == (9, 9, 3)
+    assert np.array_equal(np.asarray(from_pil), from_rgb)
+
+
+def test_rejects_arrays_that_are_not_gray_or_rgb():
+    with pytest.raises(ValueError):
+        ImageProcessor.binarize_image(np.zeros((4, 4, 2), dtype=np.uint8))
+    with pytest.raises(ValueError):
+        ImageProcessor.crop_to_content(np.zeros(16, dtype=np.uint8))
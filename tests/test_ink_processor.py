@@ -0,0 +1,154 @@
+"""
+Tests for InkML reading in La-Math-ex.
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# Add the package sources to path for local development
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from data.ink_processor import Ink, InkProcessor
+
+
+NAMESPACED_INKML = """<?xml version="1.0" encoding="UTF-8"?>
+<ink xmlns="http://www.w3.org/2003/InkML">
+  <annotation type="label">x^2</annotation>
+  <annotation type="sampleId">sample-1</annotation>
+  <trace>1 2 0,3 4 1</trace>
+  <trace>5 6 2</trace>
+</ink>
+"""
+
+BARE_INKML = """<?xml version="1.0" encoding="UTF-8"?>
+<ink>
+  <annotation type="label">y</annotation>
+  <trace>1 2 0,3 4 1</trace>
+</ink>
+"""
+
+MALFORMED_INKML = """<?xml version="1.0" encoding="UTF-8"?>
+<ink xmlns="http://www.w3.org/2003/InkML">
+  <trace>1 2,3 4 5 6</trace>
+  <trace>1 2 3, 4 5 6</trace>
+  <trace>7 8 9,x y z,10 11 12</trace>
+  <trace></trace>
+  <trace>not a point</trace>
+</ink>
+"""
+
+
+def write_inkml(tmp_path, content):
+    path = tmp_path / "sample.inkml"
+    path.write_text(content, encoding="utf-8")
+    return str(path)
+
+
+def test_read_namespaced_inkml(tmp_path):
+    ink = InkProcessor.read_inkml_file(write_inkml(tmp_path, NAMESPACED_INKML))
+    
+    assert ink.annotations == {'label': 'x^2', 'sampleId': 'sample-1'}
+    assert InkProcessor.stroke_count(ink) == 2
+    np.testing.assert_array_equal(ink.strokes[0], [[1, 3], [2, 4], [0, 1]])
+    np.testing.assert_array_equal(ink.strokes[1], [[5], [6], [2]])
+
+
+def test_read_bare_inkml(tmp_path):
+    ink = InkProcessor.read_inkml_file(write_inkml(tmp_path, BARE_INKML))
+    
+    assert ink.annotations == {'label': 'y'}
+    assert InkProcessor.stroke_count(ink) == 1
+    np.testing.assert_array_equal(ink.strokes[0], [[1, 3], [2, 4], [0, 1]])
+
+
+def test_malformed_points_and_empty_traces_are_skipped(tmp_path):
+    ink = InkProcessor.read_inkml_file(write_inkml(tmp_path, MALFORMED_INKML))
+    
+    # Only well-formed points survive; traces without any are dropped
+    assert InkProcessor.stroke_count(ink) == 2
+    np.testing.assert_array_equal(ink.strokes[0], [[1], [2], [3]])
+    np.testing.assert_array_equal(ink.strokes[1], [[7, 10], [8, 11], [9, 12]])
+
+
+def test_missing_file_raises(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        InkProcessor.read_inkml_file(str(tmp_path / "missing.inkml"))
+
+
+def test_invalid_xml_raises(tmp_path):
+    with pytest.raises(ValueError):
+        InkProcessor.read_inkml_file(write_inkml(tmp_path, "<ink><trace>"))
+
+
+
+def test_external_entities_are_not_resolved(tmp_path):
+    secret = tmp_path / "secret.txt"
+    secret.write_text("secret")
+    content = (
+        '<?xml version="1.0"?>\n'
+        f'<!DOCTYPE ink [<!ENTITY ext SYSTEM "{secret.as_uri()}">]>\n'
+        '<ink><annotation type="label">&ext;</annotation>'
+        '<trace>1 2 0</trace></ink>\n'
+    )
+    
+    ink = InkProcessor.read_inkml_file(write_inkml(tmp_path, content))
+    
+    assert ink.annotations["label"] != "secret"
+    assert len(ink.strokes) == 1
+
+
+def test_normalize_ink_accepts_integer_points():
+    ink = Ink.from_strokes([np.array([[0, 10], [0, 5], [0, 1]])])
+    
+    normalized = InkProcessor.normalize_ink(ink, target_size=(100, 100))
+    
+    assert np.issubdtype(normalized.points.dtype, np.floating)
+    np.testing.assert_allclose(normalized.strokes[0], [[0, 100], [0, 50], [0, 1]])
+    # The input ink is left untouched
+    np.testing.assert_array_equal(ink.strokes[0], [[0, 10], [0, 5], [0, 1]])
+
+
+def test_ink_can_be_built_from_strokes():
+    strokes = [np.array([[1., 2.], [3., 4.], [0., 1.]]), np.array([[5.], [6.], [2.]])]
+    
+    for ink in (Ink(strokes=strokes, annotations={'label': 'x'}),
+                Ink(strokes, {'label': 'x'}),
+                Ink(tuple(strokes), {'label': 'x'}),
+                Ink.from_strokes(strokes, {'label': 'x'})):
+        assert ink.annotations == {'label': 'x'}
+        assert InkProcessor.stroke_count(ink) == 2
+        for stroke, expected in zip(ink.strokes, strokes):
+            np.testing.assert_array_equal(stroke, expected)
+    
+    with pytest.raises(TypeError):
+        Ink()
+
+
+def test_get_bounding_boxes_matches_per_ink_boxes():
+    rng = np.random.default_rng(0)
+    empty = Ink.from_strokes([])
+    
+    def random_ink(n_strokes):
+        return Ink.from_strokes([rng.normal(size=(3, rng.integers(1, 6)))
+                                 for _ in range(n_strokes)])
+    
+    inks = [empty, random_ink(1), random_ink(3), empty, empty,
+            random_ink(2), random_ink(1), empty]
+    
+    boxes = InkProcessor.get_bounding_boxes(inks)
+    
+    assert boxes.shape == (len(inks), 4)
+    for ink, box in zip(inks, boxes):
+        expected = InkProcessor.get_bounding_box(ink)
+        if expected is None:
+            assert np.isnan(box).all()
+        else:
+            np.testing.assert_allclose(box, expected)
+
+
+def test_get_bounding_boxes_all_empty_or_none():
+    assert InkProcessor.get_bounding_boxes([]).shape == (0, 4)
+    assert np.isnan(InkProcessor.get_bounding_boxes([Ink.from_strokes([])] * 2)).all()